@@ -0,0 +1,95 @@
+"""
+Airtable read cache shared by the Creative Cloner tools
+
+Caches the result of table.all() on disk for a short time, so back-to-back
+runs (e.g. a dry run followed by the real run) don't pull the same records
+from Airtable again. Tools that write to a table call invalidate_table()
+so the next read sees their changes.
+
+Cache files live in ~/.cache/creative-cloner/ and expire after
+DEFAULT_CACHE_TTL seconds (override per call).
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+CACHE_DIR = Path.home() / '.cache' / 'creative-cloner'
+DEFAULT_CACHE_TTL = 300
+
+
+def table_prefix(table):
+    """File name prefix shared by every cached query of one table"""
+    table_name = re.sub(r'\W+', '_', str(table.name))
+    return f"airtable_{table.base.id}_{table_name}_"
+
+
+def cache_file_for(table, formula, fields):
+    """Path of the cache file for one table.all() query"""
+    query = json.dumps({'formula': formula, 'fields': fields}, sort_keys=True)
+    digest = hashlib.sha256(query.encode('utf-8')).hexdigest()[:16]
+    return CACHE_DIR / f"{table_prefix(table)}{digest}.json"
+
+
+@lru_cache(maxsize=32)
+def read_cache_file(path, mtime_ns):
+    """Parse a cache file; keyed on mtime so a rewritten file is re-read"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cached_all(table, formula=None, fields=None, page_size=100, ttl=DEFAULT_CACHE_TTL, use_cache=True):
+    """
+    table.all() with a short-lived disk cache
+
+    Returns: list of records
+    """
+    cache_file = cache_file_for(table, formula, fields)
+
+    if use_cache:
+        try:
+            stat = cache_file.stat()
+            if time.time() - stat.st_mtime < ttl:
+                records = read_cache_file(str(cache_file), stat.st_mtime_ns)
+                print(f"   ♻️  Using cached Airtable records ({int(time.time() - stat.st_mtime)}s old)")
+                return records
+        except (OSError, ValueError):
+            pass
+
+    kwargs = {'page_size': page_size}
+    if formula is not None:
+        kwargs['formula'] = formula
+    if fields is not None:
+        kwargs['fields'] = fields
+    records = table.all(**kwargs)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"   ⚠️  Warning: Could not write Airtable cache: {e}")
+
+    return records
+
+
+def invalidate_table(table):
+    """Drop every cached query for a table after writing to it"""
+    prefix = table_prefix(table)
+    try:
+        entries = list(os.scandir(CACHE_DIR))
+    except FileNotFoundError:
+        return
+
+    for entry in entries:
+        if entry.name.startswith(prefix):
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
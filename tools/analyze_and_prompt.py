@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Fused Analysis + Prompt Creator for Creative Cloner
+
+Sends the inspiration video and the reference image to Gemini in a
+single request that returns both the SEALCaM scene analysis and the
+reference subject description, then builds the image/video prompts
+from them locally.
+
+This replaces the separate analyze_video.py + create_prompts.py runs
+(two uploads' worth of round-trips and two model calls) with one model
+call. Output files are the same as the individual tools produce:
+- outputs/analysis.yaml
+- outputs/prompts.yaml
+
+Usage:
+    python tools/analyze_and_prompt.py inputs/inspo.mp4 inputs/Ref.png
+"""
+
+import sys
+import json
+import argparse
+import yaml
+from google import genai
+from google.genai import types
+
+from analyze_video import (
+    ANALYSIS_MODEL, ANALYSIS_PROMPT, VIDEO_ANALYSIS_SCHEMA, load_api_key, upload_video, save_analysis
+)
+from create_prompts import REFERENCE_PROMPT, upload_reference_image, create_prompts, save_prompts, print_prompts
+
+# Prefer the libyaml C dumper when available (much faster on large documents)
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+# Fix Windows console encoding for emojis
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Single prompt covering both the video analysis and the reference description
+FUSED_PROMPT = f"""
+You are given two inputs: a VIDEO and a REFERENCE IMAGE.
+
+PART 1 - VIDEO
+{ANALYSIS_PROMPT.replace('Now analyze the provided video.', '').strip()}
+
+PART 2 - REFERENCE IMAGE
+{REFERENCE_PROMPT.strip()}
+
+Return one JSON object with the video analysis under "video_analysis" (as
+described in part 1) and the reference image description, as a string,
+under "subject_description".
+"""
+
+# Response schema: the video analysis schema plus the subject description
+FUSED_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'video_analysis': VIDEO_ANALYSIS_SCHEMA['properties']['video_analysis'],
+        'subject_description': {'type': 'STRING'}
+    },
+    'required': ['video_analysis', 'subject_description']
+}
+
+
+def analyze_and_describe(video_file, image_file, client):
+    """Analyze the video and describe the reference image in one Gemini call"""
+    print("\n🔍 Analyzing video and reference image in a single request...")
+
+    response = client.models.generate_content(
+        model=ANALYSIS_MODEL,
+        contents=[
+            types.Part.from_uri(file_uri=video_file.uri, mime_type=video_file.mime_type),
+            types.Part.from_uri(file_uri=image_file.uri, mime_type=image_file.mime_type),
+            FUSED_PROMPT
+        ],
+        config=types.GenerateContentConfig(
+            response_mime_type='application/json',
+            response_schema=FUSED_SCHEMA
+        )
+    )
+
+    print("✅ Analysis complete")
+    return response.text
+
+
+def split_fused_result(result_text):
+    """
+    Split the fused JSON response into the analysis and the subject description
+
+    Returns: (analysis dict, subject description str)
+    """
+    try:
+        data = json.loads(result_text)
+    except ValueError as e:
+        print(f"❌ Error: Gemini returned invalid JSON: {e}")
+        sys.exit(1)
+
+    analysis = {'video_analysis': data.get('video_analysis', {})}
+    scenes = analysis['video_analysis'].get('scenes')
+    subject_description = str(data.get('subject_description', '')).strip()
+
+    if not scenes or not subject_description:
+        print("❌ Error: Response is missing scenes or subject_description")
+        print(result_text)
+        sys.exit(1)
+
+    print(f"✅ Reference description: {subject_description}")
+    return analysis, subject_description
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Analyze a video and create prompts for a reference image with one Gemini call'
+    )
+    parser.add_argument(
+        'video_path',
+        help='Path to the video file to analyze'
+    )
+    parser.add_argument(
+        'reference_image',
+        help='Path to reference image of your product/character'
+    )
+    parser.add_argument(
+        '-a', '--analysis',
+        help='Output path for video analysis YAML (default: outputs/analysis.yaml)',
+        default='outputs/analysis.yaml'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Output path for prompts YAML (default: outputs/prompts.yaml)',
+        default='outputs/prompts.yaml'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        default=600,
+        help='Max seconds to wait for Gemini to process the video (default: 600)'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🎬 Creative Cloner - Fused Analysis + Prompt Creator")
+    print("=" * 80)
+
+    # Load API key and configure Gemini
+    api_key = load_api_key()
+    client = genai.Client(api_key=api_key)
+    print("✅ Gemini API configured\n")
+
+    # Upload both inputs (the image is small, so upload it first); the image
+    # is deleted even if the video upload fails or times out
+    image_file = upload_reference_image(args.reference_image, client)
+    try:
+        video_file = upload_video(args.video_path, client, max_wait=args.timeout)
+        try:
+            result_text = analyze_and_describe(video_file, image_file, client)
+        finally:
+            client.files.delete(name=video_file.name)
+    finally:
+        client.files.delete(name=image_file.name)
+        print("🗑️  Temporary files cleaned up")
+
+    analysis, subject_description = split_fused_result(result_text)
+    save_analysis(
+        yaml.dump(analysis, Dumper=_Dumper, default_flow_style=False, sort_keys=False, allow_unicode=True),
+        args.analysis
+    )
+
+    # Build prompts from the shared templates
+    prompts = create_prompts(analysis, subject_description)
+    save_prompts(prompts, args.output, analysis)
+    print_prompts(prompts)
+
+    print("\n✨ Done! Prompts ready for image and video generation.")
+
+
+if __name__ == '__main__':
+    main()
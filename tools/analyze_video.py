@@ -17,7 +17,10 @@ Output: YAML format for easy parsing
 
 import os
 import sys
+import json
 import time
+import random
+import hashlib
 import argparse
 import mimetypes
 from pathlib import Path
@@ -26,10 +29,19 @@ from google import genai
 from google.genai import types
 import yaml
 
+# Prefer the libyaml C dumper when available (much faster on large documents)
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
 # Fix Windows console encoding for emojis
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Gemini model used for the analysis (available on free tier with video support)
+ANALYSIS_MODEL = 'gemini-2.5-flash'
+
 # SEALCaM Analysis Prompt
 ANALYSIS_PROMPT = """
 Analyze this video using the SEALCaM framework (Scene, Environment, Action, Lighting, Camera, Music).
@@ -48,33 +60,58 @@ Break down the video into distinct scenes and for each scene provide:
 Also provide:
 - **Overall Music/Sound**: Description of background music, sound effects, or audio style
 
-Format your response as a structured analysis that can be easily parsed into YAML.
-Use clear section headers and consistent formatting.
-
-Example format:
----
-video_analysis:
-  overall_duration: X seconds
-  total_scenes: N
-  music_sound: "Description of audio/music"
-
-  scenes:
-    - scene_number: 1
-      description: "..."
-      subject: "..."
-      environment: "..."
-      action: "..."
-      lighting: "..."
-      camera: "..."
-      duration: X
-
-    - scene_number: 2
-      description: "..."
-      ...
+Respond with a single JSON object (no prose, no markdown) with this structure:
+- "video_analysis": object with
+  - "overall_duration": string, e.g. "30 seconds"
+  - "total_scenes": integer, the number of scenes
+  - "music_sound": string describing the audio/music
+  - "scenes": array with one object per scene, each with
+    - "scene_number": integer, starting at 1
+    - "description", "subject", "environment", "action", "lighting",
+      "camera": strings
+    - "duration": number of seconds
 
 Now analyze the provided video.
 """
 
+# Response schema so Gemini returns the analysis as parseable JSON
+VIDEO_ANALYSIS_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'video_analysis': {
+            'type': 'OBJECT',
+            'properties': {
+                'overall_duration': {'type': 'STRING'},
+                'total_scenes': {'type': 'INTEGER'},
+                'music_sound': {'type': 'STRING'},
+                'scenes': {
+                    'type': 'ARRAY',
+                    'items': {
+                        'type': 'OBJECT',
+                        'properties': {
+                            'scene_number': {'type': 'INTEGER'},
+                            'description': {'type': 'STRING'},
+                            'subject': {'type': 'STRING'},
+                            'environment': {'type': 'STRING'},
+                            'action': {'type': 'STRING'},
+                            'lighting': {'type': 'STRING'},
+                            'camera': {'type': 'STRING'},
+                            'duration': {'type': 'NUMBER'}
+                        },
+                        'required': ['scene_number', 'description', 'subject', 'environment',
+                                     'action', 'lighting', 'camera', 'duration'],
+                        'property_ordering': ['scene_number', 'description', 'subject', 'environment',
+                                              'action', 'lighting', 'camera', 'duration']
+                    }
+                }
+            },
+            'required': ['overall_duration', 'total_scenes', 'music_sound', 'scenes'],
+            'property_ordering': ['overall_duration', 'total_scenes', 'music_sound', 'scenes']
+        }
+    },
+    'required': ['video_analysis']
+}
+
 
 def load_api_key():
     """Load Gemini API key from .env file"""
@@ -90,14 +127,22 @@ def load_api_key():
     return api_key
 
 
-def upload_video(video_path, client):
-    """Upload video to Gemini and wait for processing"""
+def start_video_upload(video_path, client):
+    """Upload video to Gemini without waiting for processing"""
     print(f"📤 Uploading video: {video_path}")
 
-    if not os.path.exists(video_path):
+    try:
+        file_size = os.path.getsize(video_path)
+    except OSError:
         print(f"❌ Error: Video file not found: {video_path}")
         sys.exit(1)
 
+    if file_size == 0:
+        print(f"❌ Error: Video file is empty: {video_path}")
+        sys.exit(1)
+
+    print(f"   Size: {file_size / (1024 * 1024):.2f} MB")
+
     # Detect mime type
     mime_type, _ = mimetypes.guess_type(video_path)
     if not mime_type:
@@ -106,22 +151,28 @@ def upload_video(video_path, client):
 
     print(f"   Detected MIME type: {mime_type}")
 
-    # Upload the video file
-    with open(video_path, 'rb') as video_data:
-        upload_response = client.files.upload(
-            file=video_data,
-            config=types.UploadFileConfig(mime_type=mime_type)
-        )
+    # Upload by path so the SDK streams the file in resumable chunks
+    # instead of holding the whole video in memory
+    upload_response = client.files.upload(
+        file=video_path,
+        config=types.UploadFileConfig(mime_type=mime_type)
+    )
 
     print(f"✅ Upload complete: {upload_response.name}")
-
-    # Wait for video processing
     print("⏳ Processing video...")
-    video_file = upload_response
-    while video_file.state == types.FileState.PROCESSING:
-        time.sleep(2)
-        video_file = client.files.get(name=video_file.name)
+    return upload_response
+
 
+def processing_poll_delays(initial=1.0, cap=15.0, factor=1.6):
+    """Yield exponential backoff delays with jitter (1s → 1.6s → 2.6s ... capped at 15s)"""
+    delay = initial
+    while True:
+        yield delay + random.uniform(0, 0.25 * delay)
+        delay = min(cap, delay * factor)
+
+
+def finish_processing(video_file):
+    """Exit if Gemini failed to process the video, otherwise return it"""
     if video_file.state == types.FileState.FAILED:
         print("❌ Video processing failed")
         sys.exit(1)
@@ -130,17 +181,42 @@ def upload_video(video_path, client):
     return video_file
 
 
+def wait_for_processing(video_file, client, max_wait=600):
+    """Poll Gemini until the uploaded video has been processed"""
+    # The Files API has no long-poll or callback, so poll with backoff
+    start_time = time.time()
+    delays = processing_poll_delays()
+    while video_file.state == types.FileState.PROCESSING:
+        if time.time() - start_time > max_wait:
+            print(f"❌ Video processing did not finish within {max_wait} seconds")
+            sys.exit(1)
+
+        time.sleep(next(delays))
+        video_file = client.files.get(name=video_file.name)
+
+    return finish_processing(video_file)
+
+
+def upload_video(video_path, client, max_wait=600):
+    """Upload video to Gemini and wait for processing"""
+    video_file = start_video_upload(video_path, client)
+    return wait_for_processing(video_file, client, max_wait)
+
+
 def analyze_video(video_file, client):
     """Analyze video using Gemini with SEALCaM framework"""
     print("\n🔍 Analyzing video with SEALCaM framework...")
 
-    # Generate analysis using Gemini 2.5 Flash (available on free tier with video support)
     response = client.models.generate_content(
-        model='gemini-2.5-flash',
+        model=ANALYSIS_MODEL,
         contents=[
             types.Part.from_uri(file_uri=video_file.uri, mime_type=video_file.mime_type),
             ANALYSIS_PROMPT
-        ]
+        ],
+        config=types.GenerateContentConfig(
+            response_mime_type='application/json',
+            response_schema=VIDEO_ANALYSIS_SCHEMA
+        )
     )
 
     print("✅ Analysis complete")
@@ -148,49 +224,62 @@ def analyze_video(video_file, client):
 
 
 def parse_to_yaml(analysis_text):
-    """Parse the analysis text to YAML format"""
+    """Convert the JSON analysis returned by Gemini to YAML"""
     print("\n📝 Formatting analysis as YAML...")
 
-    # Check if the response contains YAML in a code block
-    if '```yaml' in analysis_text or '```yml' in analysis_text:
-        # Extract YAML from code block
-        import re
-        match = re.search(r'```ya?ml\n(.*?)\n```', analysis_text, re.DOTALL)
-        if match:
-            yaml_text = match.group(1).strip()
-            try:
-                # Validate it's proper YAML
-                yaml.safe_load(yaml_text)
-                return yaml_text
-            except yaml.YAMLError as e:
-                print(f"⚠️  Warning: YAML validation failed: {e}")
-
-    # Check if the response already contains YAML
-    if '---' in analysis_text or 'video_analysis:' in analysis_text:
-        # Try to extract YAML portion
-        try:
-            # Find the YAML section
-            yaml_start = analysis_text.find('---')
-            if yaml_start != -1:
-                yaml_text = analysis_text[yaml_start:]
-            else:
-                yaml_text = analysis_text
-
-            # Validate it's proper YAML
-            yaml.safe_load(yaml_text)
-            return yaml_text
-        except yaml.YAMLError:
-            pass
-
-    # If not in YAML format, wrap the raw analysis
-    yaml_output = {
-        'video_analysis': {
-            'raw_analysis': analysis_text,
-            'note': 'Analysis returned in text format - may need manual parsing'
-        }
-    }
+    try:
+        analysis = json.loads(analysis_text)
+    except ValueError as e:
+        print(f"❌ Error: Gemini returned invalid JSON: {e}")
+        sys.exit(1)
+
+    return yaml.dump(analysis, Dumper=_Dumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+
+def video_cache_key(video_path):
+    """
+    Stream-hash the video bytes together with everything that shapes the analysis
+
+    The prompt, response schema and model name are all part of the key, so
+    changing any of them invalidates analyses cached with the old settings.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(video_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        print(f"❌ Error: Video file not found: {video_path}")
+        sys.exit(1)
+    digest.update(ANALYSIS_PROMPT.encode('utf-8'))
+    digest.update(json.dumps(VIDEO_ANALYSIS_SCHEMA, sort_keys=True).encode('utf-8'))
+    digest.update(ANALYSIS_MODEL.encode('utf-8'))
+    return digest.hexdigest()
 
-    return yaml.dump(yaml_output, default_flow_style=False, sort_keys=False)
+
+def load_cached_analysis(cache_dir, cache_key):
+    """Return a previously saved analysis YAML, or None on cache miss"""
+    cache_file = Path(cache_dir) / f"{cache_key}.yaml"
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            yaml_content = f.read()
+    except OSError:
+        return None
+
+    print(f"♻️  Using cached analysis: {cache_file}")
+    return yaml_content
+
+
+def save_cached_analysis(cache_dir, cache_key, yaml_content):
+    """Persist the analysis so re-runs on the same video skip Gemini entirely"""
+    cache_path = Path(cache_dir)
+    cache_path.mkdir(parents=True, exist_ok=True)
+    cache_file = cache_path / f"{cache_key}.yaml"
+    tmp_file = cache_path / f"{cache_key}.yaml.tmp"
+
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(yaml_content)
+    os.replace(tmp_file, cache_file)
 
 
 def save_analysis(yaml_content, output_path):
@@ -217,6 +306,17 @@ def main():
         help='Output path for YAML analysis (default: outputs/analysis.yaml)',
         default='outputs/analysis.yaml'
     )
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        default=600,
+        help='Max seconds to wait for Gemini to process the video (default: 600)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-analyze the video instead of using the cache'
+    )
 
     args = parser.parse_args()
 
@@ -224,19 +324,29 @@ def main():
     print("🎬 Creative Cloner - Video Analysis")
     print("=" * 60)
 
-    # Load API key and configure Gemini
-    api_key = load_api_key()
-    client = genai.Client(api_key=api_key)
-    print("✅ Gemini API configured\n")
+    # Reuse a previous analysis of the same video if available
+    cache_dir = Path(args.output).parent / '.cache'
+    cache_key = video_cache_key(args.video_path)
+    yaml_content = None
+    if not args.no_cache:
+        yaml_content = load_cached_analysis(cache_dir, cache_key)
+
+    video_file = None
+    if yaml_content is None:
+        # Load API key and configure Gemini
+        api_key = load_api_key()
+        client = genai.Client(api_key=api_key)
+        print("✅ Gemini API configured\n")
 
-    # Upload and process video
-    video_file = upload_video(args.video_path, client)
+        # Upload and process video
+        video_file = upload_video(args.video_path, client, max_wait=args.timeout)
 
-    # Analyze video
-    analysis = analyze_video(video_file, client)
+        # Analyze video
+        analysis = analyze_video(video_file, client)
 
-    # Convert to YAML
-    yaml_content = parse_to_yaml(analysis)
+        # Convert to YAML
+        yaml_content = parse_to_yaml(analysis)
+        save_cached_analysis(cache_dir, cache_key, yaml_content)
 
     # Save to file
     save_analysis(yaml_content, args.output)
@@ -250,8 +360,9 @@ def main():
     print("\n✨ Done! Analysis complete.")
 
     # Cleanup
-    client.files.delete(name=video_file.name)
-    print("🗑️  Temporary files cleaned up")
+    if video_file:
+        client.files.delete(name=video_file.name)
+        print("🗑️  Temporary files cleaned up")
 
 
 if __name__ == '__main__':
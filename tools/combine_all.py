@@ -8,13 +8,46 @@ Optionally adds background music with fade-out.
 
 import os
 import sys
+import json
 import argparse
 import subprocess
 import re
+import time
+import threading
+from functools import lru_cache
+from collections import deque
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from normalize_clip import is_normalized, read_sidecar
+
+# Scene number in filenames like "scene_1_..." or "Scene 2 ..."
+_SCENE_RE = re.compile(r'scene[_\s]*(\d+)', re.IGNORECASE)
+
+# Stream parameters that must match across clips for a copy concat
+_CODEC_KEYS = ('codec_type', 'codec_name', 'width', 'height', 'pix_fmt', 'sample_rate', 'channels')
+# Timing parameters that differ harmlessly once clips are remuxed to MPEG-TS
+_TIMING_KEYS = ('r_frame_rate', 'time_base')
+# Bitstream filters that convert MP4 video streams to the Annex B format MPEG-TS needs
+_ANNEXB_FILTERS = {'h264': 'h264_mp4toannexb', 'hevc': 'hevc_mp4toannexb'}
+
+# H.264 encoder arguments for the re-encode path, in auto-selection order
+VIDEO_ENCODERS = {
+    'h264_nvenc': ['-c:v', 'h264_nvenc', '-preset', 'p5', '-rc', 'vbr', '-cq', '23'],
+    'h264_qsv': ['-c:v', 'h264_qsv', '-global_quality', '23'],
+    'h264_videotoolbox': ['-c:v', 'h264_videotoolbox', '-q:v', '65'],
+    'libx264': ['-c:v', 'libx264', '-preset', 'medium', '-crf', '23']
+}
+# --hwenc choices mapped to encoder names
+HWENC_CHOICES = {
+    'nvenc': 'h264_nvenc',
+    'qsv': 'h264_qsv',
+    'vt': 'h264_videotoolbox',
+    'none': 'libx264'
+}
 
 # Fix Windows console encoding for emojis
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
 
@@ -30,7 +63,7 @@ def check_ffmpeg_installed():
         )
         if result.returncode == 0:
             # Extract version from output
-            version_line = result.stdout.split('\n')[0]
+            version_line = result.stdout.partition('\n')[0]
             print(f"✅ FFmpeg found: {version_line}")
             return True
         else:
@@ -48,106 +81,384 @@ def check_ffmpeg_installed():
         return False
 
 
+@lru_cache(maxsize=None)
+def list_ffmpeg_encoders():
+    """Return the set of encoder names this FFmpeg build supports"""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return frozenset()
+
+    # Encoder lines look like: " V....D h264_nvenc   NVIDIA NVENC H.264 encoder"
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6:
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+def select_video_encoder(hwenc='auto'):
+    """Pick the H.264 encoder for re-encoding, preferring hardware encoders"""
+    if hwenc != 'auto':
+        return HWENC_CHOICES[hwenc]
+
+    available = list_ffmpeg_encoders()
+    for encoder in VIDEO_ENCODERS:
+        if encoder in available:
+            return encoder
+    return 'libx264'
+
+
+def run_ffmpeg(cmd, stall_timeout=60, input_data=None):
+    """
+    Run FFmpeg, streaming its progress to the console as it encodes
+
+    There is no limit on total run time; FFmpeg is only killed if it stops
+    reporting progress for stall_timeout seconds. Only the last 200 stderr
+    lines are kept for error reporting, so memory stays bounded on long
+    encodes. If input_data is given it is written to FFmpeg's stdin (for
+    `-i pipe:0` inputs).
+
+    Returns: (return code, tail of stderr as str)
+    """
+    proc = subprocess.Popen(
+        [cmd[0], '-progress', 'pipe:1', '-nostats'] + cmd[1:],
+        stdin=subprocess.PIPE if input_data is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+
+    if input_data is not None:
+        def feed_stdin():
+            try:
+                proc.stdin.write(input_data)
+                proc.stdin.close()
+            except OSError:
+                # FFmpeg exited early; the error shows up in stderr
+                pass
+
+        threading.Thread(target=feed_stdin, daemon=True).start()
+
+    stderr_tail = deque(maxlen=200)
+    last_activity = time.monotonic()
+
+    def drain_stderr():
+        nonlocal last_activity
+        for line in proc.stderr:
+            last_activity = time.monotonic()
+            stderr_tail.append(line.rstrip())
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    stalled = threading.Event()
+    finished = threading.Event()
+
+    def watchdog():
+        # Kill FFmpeg only if neither progress nor log output arrives in time
+        while not finished.wait(1):
+            if time.monotonic() - last_activity > stall_timeout:
+                stalled.set()
+                proc.kill()
+                return
+
+    threading.Thread(target=watchdog, daemon=True).start()
+
+    out_time = 0.0
+    speed = 'N/A'
+    try:
+        # -progress writes key=value blocks, each ending with progress=continue/end
+        for line in proc.stdout:
+            last_activity = time.monotonic()
+            key, _, value = line.strip().partition('=')
+            if key == 'out_time_us' and value.isdigit():
+                out_time = int(value) / 1_000_000
+            elif key == 'speed':
+                speed = value
+            elif key == 'progress':
+                print(f"\r   ⏱️  Processed {out_time:.1f}s (speed {speed})", end='', flush=True)
+        proc.wait()
+    finally:
+        finished.set()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        stderr_thread.join(timeout=5)
+        print()
+
+    if stalled.is_set():
+        raise subprocess.TimeoutExpired(cmd, stall_timeout)
+
+    return proc.returncode, '\n'.join(stderr_tail)
+
+
+def get_file_sizes(video_files, max_workers=16):
+    """Stat video files concurrently and return {path: size in bytes}
+
+    Each stat is a round-trip on network-mounted directories, so running
+    them in parallel keeps listing time close to a single RTT.
+    """
+    if not video_files:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(video_files))) as executor:
+        sizes = executor.map(lambda video: video.stat().st_size, video_files)
+        return dict(zip(video_files, sizes))
+
+
 def find_video_files(input_dir, project_name=None):
-    """Find all video files in directory, optionally filtered by project name"""
+    """
+    Find all video files in directory, optionally filtered by project name
+
+    Returns: (list of video paths sorted by scene number, {path: size in bytes})
+    """
     print(f"\n📂 Looking for videos in: {input_dir}")
 
     input_path = Path(input_dir)
     if not input_path.exists():
         print(f"❌ Directory not found: {input_dir}")
-        return []
-
-    # Find all .mp4 files
-    video_files = list(input_path.glob('*.mp4'))
-
-    if project_name:
-        # Filter by project name in filename
-        video_files = [f for f in video_files if project_name.lower() in f.name.lower()]
-
-    if not video_files:
+        return [], {}
+
+    # Single directory pass: filter by extension and project name, and
+    # extract the scene number for sorting in the same loop
+    project_filter = project_name.lower() if project_name else None
+    entries = []
+    with os.scandir(input_path) as it:
+        for entry in it:
+            if not entry.name.endswith('.mp4') or not entry.is_file():
+                continue
+            if project_filter and project_filter not in entry.name.lower():
+                continue
+            # Sort by scene number; files without one go last, alphabetically
+            match = _SCENE_RE.search(entry.name)
+            scene_number = int(match.group(1)) if match else None
+            entries.append(((scene_number is None, scene_number or 0, entry.name), Path(entry.path)))
+
+    if not entries:
         print(f"❌ No video files found")
         if project_name:
             print(f"   (filtered by project name: {project_name})")
-        return []
-
-    # Sort by scene number (extract number from filename)
-    def get_scene_number(filename):
-        # Try to extract scene number from filename like "scene_1_..."
-        match = re.search(r'scene[_\s]*(\d+)', filename.name, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        # If no scene number found, use filename alphabetically
-        return filename.name
+        return [], {}
 
-    video_files.sort(key=get_scene_number)
+    entries.sort(key=lambda item: item[0])
+    video_files = [video for _, video in entries]
+    file_sizes = get_file_sizes(video_files)
 
     print(f"✅ Found {len(video_files)} video(s):")
     for i, video in enumerate(video_files, 1):
-        size_mb = video.stat().st_size / (1024 * 1024)
+        size_mb = file_sizes[video] / (1024 * 1024)
         print(f"   {i}. {video.name} ({size_mb:.2f} MB)")
 
-    return video_files
+    return video_files, file_sizes
+
+
+def probe_streams(video_file):
+    """Return the ffprobe stream list for a video, or None if probing failed"""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_streams', '-of', 'json', str(video_file)],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    try:
+        return json.loads(result.stdout).get('streams', [])
+    except ValueError:
+        return None
+
+
+def all_clips_normalized(video_files):
+    """
+    True if every clip has a normalize_clip.py sidecar with the current format
+    and all clips share the same frame size and stream layout
+
+    The normalized format doesn't pin resolution or audio, so e.g. portrait
+    and landscape clips, or clips with and without audio, still need probing.
+    """
+    layouts = set()
+    for video in video_files:
+        sidecar = read_sidecar(video)
+        if not is_normalized(sidecar) or 'stream_layout' not in sidecar:
+            return False
+        layouts.add((sidecar.get('width'), sidecar.get('height'), tuple(sidecar['stream_layout'])))
+    return len(layouts) == 1
+
+
+def check_stream_compatibility(video_files):
+    """
+    Probe all clips in parallel and pick a concat strategy
+
+    Returns: (strategy, video codec name) where strategy is
+             'copy'      - all clips share codec and timing parameters
+             'ts'        - only timing differs; remux through MPEG-TS then copy
+             're-encode' - codec parameters differ; copy concat cannot work
+             None        - probing failed, strategy unknown
+    """
+    print("\n🔬 Checking stream parameters...")
+
+    with ThreadPoolExecutor(max_workers=min(16, len(video_files))) as executor:
+        probes = list(executor.map(probe_streams, video_files))
 
+    if any(streams is None for streams in probes):
+        print("⚠️  Could not probe all videos (is ffprobe installed?), skipping check")
+        return None, None
 
-def create_concat_file(video_files, concat_file_path):
-    """Create FFmpeg concat file listing all videos"""
-    print(f"\n📝 Creating concat file: {concat_file_path.name}")
+    def signature(streams, keys):
+        return tuple(tuple(stream.get(k) for k in keys) for stream in streams)
 
-    with open(concat_file_path, 'w', encoding='utf-8') as f:
-        for video in video_files:
-            # Use absolute path and escape special characters
-            abs_path = video.resolve()
-            # FFmpeg concat format: file 'path'
-            # Use forward slashes even on Windows (FFmpeg prefers this)
-            path_str = str(abs_path).replace('\\', '/')
-            f.write(f"file '{path_str}'\n")
+    video_codec = next(
+        (stream.get('codec_name') for stream in probes[0] if stream.get('codec_type') == 'video'),
+        None
+    )
+
+    reference = signature(probes[0], _CODEC_KEYS)
+    mismatched = [video.name for video, streams in zip(video_files, probes)
+                  if signature(streams, _CODEC_KEYS) != reference]
+    if mismatched:
+        print(f"⚠️  Codec parameters differ from {video_files[0].name}: {', '.join(mismatched)}")
+        return 're-encode', video_codec
+
+    reference = signature(probes[0], _TIMING_KEYS)
+    mismatched = [video.name for video, streams in zip(video_files, probes)
+                  if signature(streams, _TIMING_KEYS) != reference]
+    if mismatched:
+        print(f"⚠️  Timing parameters differ from {video_files[0].name}: {', '.join(mismatched)}")
+        return 'ts', video_codec
 
-    print(f"✅ Concat file created with {len(video_files)} video(s)")
+    print("✅ All videos share codec and timing parameters")
+    return 'copy', video_codec
 
 
-def combine_videos(concat_file, output_file, copy_codec=True):
-    """Combine videos using FFmpeg"""
-    print(f"\n🎬 Combining videos...")
+def remux_to_ts(video_file, ts_file, video_codec):
+    """Remux a clip to MPEG-TS without re-encoding"""
+    cmd = ['ffmpeg', '-v', 'error', '-i', str(video_file), '-c', 'copy']
+    bsf = _ANNEXB_FILTERS.get(video_codec)
+    if bsf:
+        cmd += ['-bsf:v', bsf]
+    cmd += ['-f', 'mpegts', '-y', str(ts_file)]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def remux_all_to_ts(video_files, video_codec):
+    """
+    Remux every clip to an MPEG-TS intermediate (FFmpeg's recommended
+    workflow for concatenating MP4s whose timebases differ)
+
+    Returns: List of .ts paths, or None if any remux failed
+    """
+    print(f"\n🔁 Remuxing {len(video_files)} video(s) to MPEG-TS intermediates...")
+    ts_files = [video.with_name(f"{video.stem}.concat.ts") for video in video_files]
+
+    with ThreadPoolExecutor(max_workers=min(4, len(video_files))) as executor:
+        results = list(executor.map(
+            lambda pair: remux_to_ts(pair[0], pair[1], video_codec),
+            zip(video_files, ts_files)
+        ))
+
+    if not all(results):
+        print("❌ Remux to MPEG-TS failed")
+        for ts_file in ts_files:
+            ts_file.unlink(missing_ok=True)
+        return None
+
+    print(f"✅ Remuxed {len(ts_files)} video(s)")
+    return ts_files
+
+
+def build_concat_list(video_files):
+    """Build the FFmpeg concat demuxer list for all videos in memory"""
+    # Resolve each parent directory once rather than every file (all clips
+    # normally share one directory). as_posix() gives forward slashes even
+    # on Windows, which FFmpeg prefers.
+    resolved_dirs = {}
+    lines = []
+    for video in video_files:
+        base = resolved_dirs.get(video.parent)
+        if base is None:
+            base = resolved_dirs[video.parent] = video.parent.resolve().as_posix()
+        # FFmpeg concat format: file 'path'
+        lines.append(f"file '{base}/{video.name}'\n")
+
+    return ''.join(lines)
+
+
+def combine_videos(video_files, output_file, copy_codec=True, music_file=None, fade_duration=2,
+                   stall_timeout=60, video_encoder='libx264'):
+    """Combine videos using FFmpeg, optionally muxing in background music in the same pass"""
+    print(f"\n🎬 Combining {len(video_files)} video(s)...")
     print(f"   Output: {output_file}")
 
+    # The concat list is fed to FFmpeg over stdin, so no list file touches disk
+    cmd = [
+        'ffmpeg',
+        '-f', 'concat',
+        '-safe', '0',
+        '-protocol_whitelist', 'pipe,file',
+        '-i', 'pipe:0'
+    ]
+    if music_file:
+        cmd += ['-i', str(music_file)]
+
     if copy_codec:
-        # Use -c copy for fast concatenation (no re-encoding)
+        # Use copy codec for fast concatenation (no re-encoding)
         print(f"   Mode: Fast (copy codec, no re-encoding)")
-        cmd = [
-            'ffmpeg',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', str(concat_file),
-            '-c', 'copy',
-            '-y',  # Overwrite output file
-            str(output_file)
-        ]
+        cmd += ['-c:v', 'copy'] if music_file else ['-c', 'copy']
+        cmd += ['-movflags', '+faststart']
     else:
         # Re-encode (slower but more compatible)
         print(f"   Mode: Re-encode (slower, more compatible)")
-        cmd = [
-            'ffmpeg',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', str(concat_file),
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
-            '-c:a', 'aac',
-            '-y',
-            str(output_file)
+        print(f"   Encoder: {video_encoder}")
+        cmd += VIDEO_ENCODERS[video_encoder]
+        if not music_file:
+            cmd += ['-c:a', 'aac']
+
+    if music_file:
+        # Fade the music and map it over the concatenated video directly,
+        # avoiding a temp file and a second FFmpeg pass
+        print(f"   Music: {music_file}")
+        print(f"   Fade-out: {fade_duration}s")
+        cmd += [
+            '-filter_complex', f'[1:a]afade=t=out:st=0:d={fade_duration}[audio]',
+            '-map', '0:v',  # Video from concatenated clips
+            '-map', '[audio]',  # Faded audio
+            '-c:a', 'aac',  # Encode audio as AAC
+            '-shortest'  # Stop when shortest stream ends (video)
         ]
 
+    cmd += [
+        '-y',  # Overwrite output file
+        str(output_file)
+    ]
+
     try:
         # Run FFmpeg with progress output
-        result = subprocess.run(
+        returncode, stderr = run_ffmpeg(
             cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minutes timeout
+            stall_timeout=stall_timeout,
+            input_data=build_concat_list(video_files)
         )
 
-        if result.returncode == 0:
+        if returncode == 0:
             output_path = Path(output_file)
             if output_path.exists():
                 size_mb = output_path.stat().st_size / (1024 * 1024)
@@ -156,20 +467,32 @@ def combine_videos(concat_file, output_file, copy_codec=True):
             else:
                 print(f"❌ FFmpeg succeeded but output file not found")
                 return False
+        elif not copy_codec and video_encoder != 'libx264':
+            # Encoder is compiled in but the hardware may be missing/busy
+            print(f"⚠️  {video_encoder} failed, retrying with libx264")
+            return combine_videos(
+                video_files,
+                output_file,
+                copy_codec=False,
+                music_file=music_file,
+                fade_duration=fade_duration,
+                stall_timeout=stall_timeout,
+                video_encoder='libx264'
+            )
         else:
             print(f"❌ FFmpeg failed:")
-            print(f"   Error: {result.stderr}")
+            print(f"   Error: {stderr}")
             return False
 
     except subprocess.TimeoutExpired:
-        print("❌ FFmpeg timed out (took more than 5 minutes)")
+        print(f"❌ FFmpeg stalled (no progress for {stall_timeout}s)")
         return False
     except Exception as e:
         print(f"❌ Error running FFmpeg: {e}")
         return False
 
 
-def add_background_music(video_file, music_file, output_file, fade_duration=2):
+def add_background_music(video_file, music_file, output_file, fade_duration=2, stall_timeout=60):
     """Add background music to video with fade-out"""
     print(f"\n🎵 Adding background music...")
     print(f"   Music: {music_file}")
@@ -198,14 +521,9 @@ def add_background_music(video_file, music_file, output_file, fade_duration=2):
     ]
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        returncode, stderr = run_ffmpeg(cmd, stall_timeout=stall_timeout)
 
-        if result.returncode == 0:
+        if returncode == 0:
             output_path = Path(output_file)
             if output_path.exists():
                 size_mb = output_path.stat().st_size / (1024 * 1024)
@@ -216,11 +534,11 @@ def add_background_music(video_file, music_file, output_file, fade_duration=2):
                 return False
         else:
             print(f"❌ FFmpeg failed:")
-            print(f"   Error: {result.stderr}")
+            print(f"   Error: {stderr}")
             return False
 
     except subprocess.TimeoutExpired:
-        print("❌ FFmpeg timed out")
+        print(f"❌ FFmpeg stalled (no progress for {stall_timeout}s)")
         return False
     except Exception as e:
         print(f"❌ Error adding music: {e}")
@@ -229,6 +547,9 @@ def add_background_music(video_file, music_file, output_file, fade_duration=2):
 
 def cleanup_temp_files(files):
     """Clean up temporary files"""
+    if not files:
+        return
+
     print(f"\n🗑️  Cleaning up temporary files...")
 
     cleaned = 0
@@ -302,6 +623,19 @@ Examples:
         action='store_true',
         help='Re-encode videos (slower but more compatible, use if fast mode fails)'
     )
+    parser.add_argument(
+        '--hwenc',
+        choices=['auto', 'nvenc', 'qsv', 'vt', 'none'],
+        default='auto',
+        help='Encoder used when re-encoding: hardware (nvenc/qsv/vt), none for libx264, '
+             'or auto to pick the best available (default: auto)'
+    )
+    parser.add_argument(
+        '--stall-timeout',
+        type=int,
+        default=60,
+        help='Abort FFmpeg if it reports no progress for this many seconds (default: 60)'
+    )
 
     args = parser.parse_args()
 
@@ -314,7 +648,7 @@ Examples:
         sys.exit(1)
 
     # Find video files
-    video_files = find_video_files(args.input_dir, args.project_name)
+    video_files, file_sizes = find_video_files(args.input_dir, args.project_name)
     if not video_files:
         sys.exit(1)
 
@@ -328,7 +662,7 @@ Examples:
         print("\n🔍 DRY RUN MODE - No files will be created")
         print("\nWould combine these videos in order:")
         for i, video in enumerate(video_files, 1):
-            size_mb = video.stat().st_size / (1024 * 1024)
+            size_mb = file_sizes[video] / (1024 * 1024)
             print(f"   {i}. {video.name} ({size_mb:.2f} MB)")
         print(f"\nOutput would be: {args.output}")
         if args.music:
@@ -337,52 +671,90 @@ Examples:
         print("\n✅ Dry run complete")
         return
 
-    # Create temporary concat file
-    concat_file = Path(args.input_dir) / 'videos_concat_list.txt'
-    temp_files = [concat_file]
+    temp_files = []
 
     try:
-        # Create concat file
-        create_concat_file(video_files, concat_file)
+        # Validate stream parameters so copy concat only runs when it can work
+        copy_codec = not args.re_encode
+        concat_inputs = video_files
+        if copy_codec and all_clips_normalized(video_files):
+            print("\n✅ All clips were normalized to the same format, using copy concat")
+        elif copy_codec:
+            strategy, video_codec = check_stream_compatibility(video_files)
+            if strategy == 'ts':
+                ts_files = remux_all_to_ts(video_files, video_codec)
+                if ts_files:
+                    temp_files.extend(ts_files)
+                    concat_inputs = ts_files
+                else:
+                    copy_codec = False
+            elif strategy == 're-encode':
+                copy_codec = False
+
+            if not copy_codec:
+                print("   Falling back to re-encode")
+
+        video_encoder = 'libx264' if copy_codec else select_video_encoder(args.hwenc)
 
         # Determine output files
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         if args.music:
-            # If music is provided, combine to temp file first, then add music
-            temp_output = output_path.parent / f"temp_{output_path.name}"
-            temp_files.append(temp_output)
-
-            # Combine videos
-            success = combine_videos(
-                concat_file,
-                temp_output,
-                copy_codec=not args.re_encode
-            )
-
-            if not success:
-                print("\n⚠️  If the error mentions 'Non-monotonous DTS', try using --re-encode flag")
+            if not Path(args.music).exists():
+                print(f"❌ Music file not found: {args.music}")
                 cleanup_temp_files(temp_files)
                 sys.exit(1)
 
-            # Add music
-            success = add_background_music(
-                temp_output,
-                args.music,
+            # Concat and add music in a single FFmpeg pass
+            success = combine_videos(
+                concat_inputs,
                 output_path,
-                args.fade_duration
+                copy_codec=copy_codec,
+                music_file=args.music,
+                fade_duration=args.fade_duration,
+                stall_timeout=args.stall_timeout,
+                video_encoder=video_encoder
             )
 
             if not success:
-                cleanup_temp_files(temp_files)
-                sys.exit(1)
+                # Fall back to the two-pass flow: combine to temp file, then add music
+                print("\n⚠️  Single-pass combine failed, retrying in two passes...")
+                temp_output = output_path.parent / f"temp_{output_path.name}"
+                temp_files.append(temp_output)
+
+                success = combine_videos(
+                    concat_inputs,
+                    temp_output,
+                    copy_codec=copy_codec,
+                    stall_timeout=args.stall_timeout,
+                    video_encoder=video_encoder
+                )
+
+                if not success:
+                    print("\n⚠️  If the error mentions 'Non-monotonous DTS', try using --re-encode flag")
+                    cleanup_temp_files(temp_files)
+                    sys.exit(1)
+
+                success = add_background_music(
+                    temp_output,
+                    args.music,
+                    output_path,
+                    args.fade_duration,
+                    stall_timeout=args.stall_timeout
+                )
+
+                if not success:
+                    cleanup_temp_files(temp_files)
+                    sys.exit(1)
         else:
             # No music, just combine
             success = combine_videos(
-                concat_file,
+                concat_inputs,
                 output_path,
-                copy_codec=not args.re_encode
+                copy_codec=copy_codec,
+                stall_timeout=args.stall_timeout,
+                video_encoder=video_encoder
             )
 
             if not success:
@@ -398,7 +770,8 @@ Examples:
         print("✅ VIDEO COMBINATION COMPLETE!")
         print("=" * 80)
         print(f"📹 Final video: {output_path.resolve()}")
-        print(f"📊 Combined {len(video_files)} video(s)")
+        input_size_mb = sum(file_sizes.values()) / (1024 * 1024)
+        print(f"📊 Combined {len(video_files)} video(s) ({input_size_mb:.2f} MB input)")
         if args.music:
             print(f"🎵 Background music: {args.music}")
 
@@ -12,18 +12,71 @@ replacing the subject with the new product/character.
 
 import os
 import sys
+import json
+import pickle
+import hashlib
 import argparse
+from string import Template
+from functools import partial
 from pathlib import Path
 from dotenv import load_dotenv
 import yaml
 from google import genai
 from google.genai import types
 
+# Prefer the libyaml C loader/dumper when available (much faster on large documents)
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 # Fix Windows console encoding for emojis
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
 
+# Reference image description prompt
+REFERENCE_PROMPT = """
+    Describe this product/character in detail for use in image generation prompts.
+
+    Focus on:
+    - What is it? (person, product, character, mascot, etc.)
+    - Key visual features (colors, shape, distinctive elements)
+    - Style (realistic, cartoon, 3D render, etc.)
+    - Any text, logos, or branding
+    - Size/scale context if relevant
+
+    Be specific and descriptive but concise (2-3 sentences).
+    This description will be used to generate images of this subject in different scenes.
+    """
+
+
+# IMAGE PROMPT template for NanoBanana Pro
+IMAGE_PROMPT_TEMPLATE = Template("""$subject
+
+Setting: $environment
+Lighting: $lighting
+Camera: $camera
+
+The subject is in this position/pose: $pose.
+
+Style: Photorealistic, high quality, professional photography
+Details: Sharp focus, natural colors, $lighting_details""")
+
+# VIDEO PROMPT template for Kling 2.6
+VIDEO_PROMPT_TEMPLATE = Template("""Camera Type: $camera
+
+Main Movement: $subject $action
+
+Setting: $environment
+Lighting: $lighting
+
+Motion details: $action
+Duration: $duration seconds
+
+Style: Smooth, natural motion, high quality video, realistic physics""")
+
+
 def load_api_key():
     """Load Gemini API key from .env file"""
     env_path = Path(__file__).parent.parent / '.agent' / '.env'
@@ -39,15 +92,46 @@ def load_api_key():
 
 
 def load_analysis(analysis_path):
-    """Load video analysis from YAML file"""
+    """
+    Load video analysis from YAML file
+
+    The parsed analysis is cached in a `<analysis>.pkl` sidecar next to the
+    YAML. The sidecar is trusted local data written by this script (pickle
+    can run code, so never point this at files from elsewhere); if it can't
+    be read for any reason the YAML is parsed again.
+    """
     print(f"📖 Loading video analysis from: {analysis_path}")
 
     if not os.path.exists(analysis_path):
         print(f"❌ Error: Analysis file not found: {analysis_path}")
         sys.exit(1)
 
-    with open(analysis_path, 'r', encoding='utf-8') as f:
-        analysis = yaml.safe_load(f)
+    # Reuse the pickled parse from a previous run if the YAML is unchanged
+    stat = os.stat(analysis_path)
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    cache_path = f"{analysis_path}.pkl"
+
+    analysis = None
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, cached_analysis = pickle.load(f)
+        if cached_key == cache_key:
+            analysis = cached_analysis
+    except Exception:
+        # Missing, truncated, wrong shape or from an incompatible version
+        analysis = None
+
+    if analysis is None:
+        with open(analysis_path, 'r', encoding='utf-8') as f:
+            analysis = yaml.load(f, Loader=_Loader)
+
+        try:
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((cache_key, analysis), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write parse cache: {e}")
 
     print(f"✅ Loaded analysis with {analysis['video_analysis']['total_scenes']} scenes")
     return analysis
@@ -84,25 +168,11 @@ def describe_reference(image_file, client):
     """Describe the reference product/character using Gemini"""
     print("\n🔍 Analyzing reference image...")
 
-    prompt = """
-    Describe this product/character in detail for use in image generation prompts.
-
-    Focus on:
-    - What is it? (person, product, character, mascot, etc.)
-    - Key visual features (colors, shape, distinctive elements)
-    - Style (realistic, cartoon, 3D render, etc.)
-    - Any text, logos, or branding
-    - Size/scale context if relevant
-
-    Be specific and descriptive but concise (2-3 sentences).
-    This description will be used to generate images of this subject in different scenes.
-    """
-
     response = client.models.generate_content(
         model='gemini-2.5-flash',
         contents=[
             types.Part.from_uri(file_uri=image_file.uri, mime_type=image_file.mime_type),
-            prompt
+            REFERENCE_PROMPT
         ]
     )
 
@@ -111,53 +181,98 @@ def describe_reference(image_file, client):
     return description
 
 
-def create_prompts(analysis, subject_description):
-    """Create image and video prompts for each scene"""
-    print("\n✨ Creating prompts for each scene...")
+def reference_cache_key(image_path):
+    """Hash the reference image bytes together with the description prompt"""
+    if not os.path.exists(image_path):
+        print(f"❌ Error: Reference image not found: {image_path}")
+        sys.exit(1)
 
-    prompts = []
-    scenes = analysis['video_analysis']['scenes']
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(REFERENCE_PROMPT.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_cached_description(cache_dir, cache_key):
+    """Return a previously saved reference description, or None on cache miss"""
+    cache_file = Path(cache_dir) / f"{cache_key}.json"
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            description = json.load(f).get('description')
+    except (OSError, ValueError):
+        return None
+
+    if description:
+        print(f"\n♻️  Using cached reference description: {cache_file}")
+        print(f"✅ Reference description: {description}")
+    return description
 
-    for scene in scenes:
-        scene_num = scene['scene_number']
-        print(f"\n   Scene {scene_num}:")
 
-        # Create IMAGE PROMPT for NanoBanana Pro
-        image_prompt = f"""{subject_description}
+def save_cached_description(cache_dir, cache_key, description):
+    """Persist the reference description so re-runs skip upload and analysis"""
+    cache_path = Path(cache_dir)
+    cache_path.mkdir(parents=True, exist_ok=True)
+    cache_file = cache_path / f"{cache_key}.json"
+    tmp_file = cache_path / f"{cache_key}.json.tmp"
 
-Setting: {scene['environment']}
-Lighting: {scene['lighting']}
-Camera: {scene['camera']}
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'description': description}, f, ensure_ascii=False)
+    os.replace(tmp_file, cache_file)
 
-The subject is in this position/pose: {scene['action'].split('.')[0]}.
 
-Style: Photorealistic, high quality, professional photography
-Details: Sharp focus, natural colors, {scene['lighting'].lower()}"""
+def build_prompt_for_scene(scene, subject_description):
+    """Create the image and video prompt pair for a single scene"""
+    scene_num = scene['scene_number']
+    print(f"\n   Scene {scene_num}:")
+
+    # Per-scene values shared by both prompts
+    lighting = scene['lighting']
+    action = scene['action']
 
-        print(f"      ✓ Image prompt created")
+    # Create IMAGE PROMPT for NanoBanana Pro
+    image_prompt = IMAGE_PROMPT_TEMPLATE.substitute(
+        subject=subject_description,
+        environment=scene['environment'],
+        lighting=lighting,
+        camera=scene['camera'],
+        pose=action.split('.', 1)[0],
+        lighting_details=lighting.lower()
+    )
+
+    print(f"      ✓ Image prompt created")
 
-        # Create VIDEO PROMPT for Kling 2.6
-        video_prompt = f"""Camera Type: {scene['camera']}
+    # Create VIDEO PROMPT for Kling 2.6
+    video_prompt = VIDEO_PROMPT_TEMPLATE.substitute(
+        camera=scene['camera'],
+        subject=subject_description,
+        action=action,
+        environment=scene['environment'],
+        lighting=lighting,
+        duration=scene['duration']
+    )
 
-Main Movement: {subject_description} {scene['action']}
+    print(f"      ✓ Video prompt created")
 
-Setting: {scene['environment']}
-Lighting: {scene['lighting']}
+    return {
+        'scene_number': scene_num,
+        'scene_description': scene['description'],
+        'duration': scene['duration'],
+        'image_prompt': image_prompt,
+        'video_prompt': video_prompt
+    }
 
-Motion details: {scene['action']}
-Duration: {scene['duration']} seconds
 
-Style: Smooth, natural motion, high quality video, realistic physics"""
+def create_prompts(analysis, subject_description):
+    """Create image and video prompts for each scene"""
+    print("\n✨ Creating prompts for each scene...")
 
-        print(f"      ✓ Video prompt created")
+    scenes = analysis['video_analysis']['scenes']
 
-        prompts.append({
-            'scene_number': scene_num,
-            'scene_description': scene['description'],
-            'duration': scene['duration'],
-            'image_prompt': image_prompt.strip(),
-            'video_prompt': video_prompt.strip()
-        })
+    # Scenes are independent, so this map can move to a ThreadPoolExecutor
+    # once building a prompt involves a per-scene API call
+    prompts = list(map(partial(build_prompt_for_scene, subject_description=subject_description), scenes))
 
     print(f"\n✅ Created {len(prompts)} prompt pairs")
     return prompts
@@ -168,17 +283,25 @@ def save_prompts(prompts, output_path, analysis):
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    output_data = {
+    metadata = {
         'metadata': {
             'total_scenes': len(prompts),
             'total_duration': analysis['video_analysis']['overall_duration'],
             'music_sound': analysis['video_analysis']['music_sound']
-        },
-        'prompts': prompts
+        }
     }
-
-    with open(output_file, 'w', encoding='utf-8') as f:
-        yaml.dump(output_data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    dump_options = {'Dumper': _Dumper, 'default_flow_style': False, 'sort_keys': False, 'allow_unicode': True}
+
+    # Emit the metadata block, then one prompt entry at a time, so only a
+    # single serialized prompt is held in memory
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        yaml.dump(metadata, f, **dump_options)
+        if not prompts:
+            f.write("prompts: []\n")
+        else:
+            f.write("prompts:\n")
+            for prompt in prompts:
+                yaml.dump([prompt], f, **dump_options)
 
     print(f"\n💾 Prompts saved to: {output_path}")
 
@@ -225,6 +348,11 @@ def main():
         help='Output path for prompts YAML (default: outputs/prompts.yaml)',
         default='outputs/prompts.yaml'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-describe the reference image instead of using the cache'
+    )
 
     args = parser.parse_args()
 
@@ -240,9 +368,18 @@ def main():
     # Load video analysis
     analysis = load_analysis(args.analysis)
 
-    # Upload and analyze reference image
-    image_file = upload_reference_image(args.reference_image, client)
-    subject_description = describe_reference(image_file, client)
+    # Describe reference image (cached by image content + prompt)
+    cache_dir = Path(args.output).parent / '.ref_cache'
+    cache_key = reference_cache_key(args.reference_image)
+    subject_description = None
+    if not args.no_cache:
+        subject_description = load_cached_description(cache_dir, cache_key)
+
+    image_file = None
+    if not subject_description:
+        image_file = upload_reference_image(args.reference_image, client)
+        subject_description = describe_reference(image_file, client)
+        save_cached_description(cache_dir, cache_key, subject_description)
 
     # Create prompts
     prompts = create_prompts(analysis, subject_description)
@@ -254,8 +391,9 @@ def main():
     print_prompts(prompts)
 
     # Cleanup
-    client.files.delete(name=image_file.name)
-    print("\n🗑️  Temporary files cleaned up")
+    if image_file:
+        client.files.delete(name=image_file.name)
+        print("\n🗑️  Temporary files cleaned up")
     print("\n✨ Done! Prompts ready for image and video generation.")
 
 
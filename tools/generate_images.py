@@ -14,15 +14,38 @@ import os
 import sys
 import time
 import json
+import base64
+import hashlib
+import tempfile
+import random
 import argparse
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
 from pyairtable import Api
 from pyairtable.utils import attachment
 
+from _airtable_cache import invalidate_table
+
+# Optional: stream multipart uploads instead of building the body in memory
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Optional: faster JSON encoding/decoding for API bodies and status polls
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Fix Windows console encoding
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
 # Model configurations
@@ -42,14 +65,153 @@ MODELS = {
         'supports_resolution': True,
         'max_prompt_length': 10000,     # Much higher limit
         'default_resolution': '1K',
-        'default_aspect_ratio': '1:1'
+        'default_aspect_ratio': '1:1',
+        'extra_input': {'output_format': 'png'}
     }
 }
 
+
+def make_payload_builder(model_config):
+    """
+    Create a createTask payload builder for one model
+
+    The model's feature flags are resolved here once, so building a payload
+    per scene is just filling in the per-scene values.
+    """
+    model_name = model_config['name']
+    supports_resolution = model_config.get('supports_resolution', False)
+    supports_image_input = model_config.get('supports_image_input', False)
+    extra_input = dict(model_config.get('extra_input', {}))
+
+    def build_payload(prompt, aspect_ratio, resolution, reference_image_url=None):
+        model_input = {'prompt': prompt, 'aspect_ratio': aspect_ratio}
+        if supports_resolution:
+            model_input['resolution'] = resolution
+        model_input.update(extra_input)
+        if supports_image_input and reference_image_url:
+            model_input['image_input'] = [reference_image_url]
+        return {'model': model_name, 'input': model_input}
+
+    return build_payload
+
+
+for _model_config in MODELS.values():
+    _model_config['build_payload'] = make_payload_builder(_model_config)
+
 # API Endpoints
 KIE_FILE_UPLOAD_URL = 'https://kieai.redpandaai.co/api/file-stream-upload'
 KIE_CREATE_TASK_URL = 'https://api.kie.ai/api/v1/jobs/createTask'
 KIE_TASK_STATUS_URL = 'https://api.kie.ai/api/v1/jobs/recordInfo'
+AIRTABLE_UPLOAD_URL = 'https://content.airtable.com/v0/{base_id}/{record_id}/{field_name}/uploadAttachment'
+
+# Airtable's direct upload endpoint only accepts files up to 5 MB
+AIRTABLE_UPLOAD_MAX_BYTES = 5 * 1024 * 1024
+
+
+
+def create_session(pool_size=32):
+    """Create an HTTP session with a keep-alive connection pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Shared HTTP session so uploads, task creation and polling reuse
+# keep-alive connections instead of a new TCP + TLS handshake per call
+SESSION = create_session()
+
+# Client-side request budget shared by all worker threads
+REQUESTS_PER_SECOND = 5
+REQUEST_BURST = 10
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Airtable accepts at most 10 records per batch request
+AIRTABLE_BATCH_SIZE = 10
+
+# Airtable allows 5 requests per second per base
+AIRTABLE_REQUESTS_PER_SECOND = 5
+
+# Scene columns read from Airtable
+SCENE_FIELDS = ['scene', 'start_image_prompt', 'start_image']
+
+# File types auto-detected as reference images in inputs/
+REFERENCE_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+# Reference image uploads are cached by content hash for a week
+UPLOAD_CACHE_PATH = Path(__file__).parent.parent / '.agent' / '.kie_upload_cache.json'
+UPLOAD_CACHE_TTL = 7 * 24 * 3600
+
+# Created task IDs, keyed by idempotency key, so an interrupted run
+# resumes polling instead of paying for a second generation
+TASK_STORE_PATH = Path(__file__).parent.parent / '.agent' / '.kie_task_store.json'
+TASK_STORE_TTL = 24 * 3600
+TASK_STORE_LOCK = threading.Lock()
+
+# Task polling schedule: generation takes 15-60s, so wait before the first
+# poll, then back off 3s → 4.5s → 6.75s ... capped at 15s
+POLL_INITIAL_DELAY = 10
+POLL_BASE_DELAY = 3
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 15
+
+
+class TokenBucket:
+    """Thread-safe token bucket so concurrent workers self-throttle before the API does"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold all requests for a while, e.g. until a server rate limit resets"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+RATE_LIMITER = TokenBucket(REQUESTS_PER_SECOND, REQUEST_BURST)
+
+# Separate budget for the direct Airtable uploads made from worker threads
+AIRTABLE_RATE_LIMITER = TokenBucket(AIRTABLE_REQUESTS_PER_SECOND, AIRTABLE_REQUESTS_PER_SECOND)
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj):
+    """Serialize an object to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 
 def load_config():
@@ -73,7 +235,98 @@ def load_config():
     return config
 
 
-def upload_reference_image_to_kie(image_path, api_key):
+def retry_after_seconds(response):
+    """
+    Read the server's requested wait from Retry-After / X-RateLimit-Reset
+
+    Returns: seconds to wait (float), or None if no usable hint
+    """
+    for header in ('Retry-After', 'X-RateLimit-Reset'):
+        value = response.headers.get(header)
+        if not value:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        # X-RateLimit-Reset is often an epoch timestamp rather than a delay
+        if seconds > time.time() / 2:
+            seconds -= time.time()
+        return max(0.0, seconds)
+    return None
+
+
+def request_with_retry(method, url, max_retries=5, base=1.0, cap=30.0, session=SESSION,
+                       limiter=RATE_LIMITER, **kwargs):
+    """
+    Send a request on the session, retrying 429/5xx responses and network errors
+
+    Waits use decorrelated jitter (min(cap, uniform(base, previous * 3)))
+    unless the server says how long to wait.
+
+    Returns: the final response (which may still be an error status)
+    """
+    sleep = base
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            if attempt == max_retries:
+                raise
+            response = None
+
+        # Out of server-side quota: hold every worker until it resets
+        if response is not None and response.headers.get('X-RateLimit-Remaining') == '0':
+            limiter.pause(min(cap, retry_after_seconds(response) or 1.0))
+
+        if response is not None and response.status_code not in RETRY_STATUS_CODES:
+            return response
+        if attempt == max_retries:
+            return response
+
+        sleep = min(cap, random.uniform(base, sleep * 3))
+        hinted = retry_after_seconds(response) if response is not None else None
+        wait = min(cap, hinted) if hinted is not None else sleep
+
+        reason = response.status_code if response is not None else 'network error'
+        print(f"   ⚠️  {method} {reason}, retrying in {wait:.1f}s ({attempt + 1}/{max_retries})")
+        time.sleep(wait)
+
+
+def file_sha256(file_path):
+    """Hash a file in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_upload_cache():
+    """Load the sha256 -> {url, uploaded_at} map of previous uploads"""
+    try:
+        with open(UPLOAD_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_upload_cache(cache):
+    """Write the upload cache atomically, dropping expired entries"""
+    now = time.time()
+    cache = {k: v for k, v in cache.items() if now - v.get('uploaded_at', 0) < UPLOAD_CACHE_TTL}
+    try:
+        UPLOAD_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = UPLOAD_CACHE_PATH.with_name(UPLOAD_CACHE_PATH.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, UPLOAD_CACHE_PATH)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write upload cache: {e}")
+
+
+def upload_reference_image_to_kie(image_path, api_key, session=SESSION):
     """
     Upload reference image to Kie.ai file hosting
 
@@ -84,31 +337,58 @@ def upload_reference_image_to_kie(image_path, api_key):
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Reference image not found: {image_path}")
 
+    # Skip the upload if this exact file was uploaded recently
+    digest = file_sha256(image_path)
+    cache = load_upload_cache()
+    cached = cache.get(digest)
+    if cached and time.time() - cached.get('uploaded_at', 0) < UPLOAD_CACHE_TTL:
+        print(f"♻️  Using cached upload: {cached['url']}")
+        return cached['url']
+
     headers = {
         'Authorization': f'Bearer {api_key}'
     }
 
-    with open(image_path, 'rb') as f:
-        files = {
-            'file': (os.path.basename(image_path), f, 'image/jpeg')
-        }
-        data = {
-            'uploadPath': 'creative-cloner',
-            'fileName': os.path.basename(image_path)
-        }
+    file_name = os.path.basename(image_path)
+    mime_type = mimetypes.guess_type(image_path)[0] or 'image/jpeg'
 
-        response = requests.post(
-            KIE_FILE_UPLOAD_URL,
-            headers=headers,
-            files=files,
-            data=data,
-            timeout=60
-        )
+    RATE_LIMITER.acquire()
+    with open(image_path, 'rb') as f:
+        if MultipartEncoder is not None:
+            # Stream the body to the socket in chunks
+            encoder = MultipartEncoder(fields={
+                'file': (file_name, f, mime_type),
+                'uploadPath': 'creative-cloner',
+                'fileName': file_name
+            })
+            headers['Content-Type'] = encoder.content_type
+            response = session.post(
+                KIE_FILE_UPLOAD_URL,
+                headers=headers,
+                data=encoder,
+                timeout=60
+            )
+        else:
+            files = {
+                'file': (file_name, f, mime_type)
+            }
+            data = {
+                'uploadPath': 'creative-cloner',
+                'fileName': file_name
+            }
+
+            response = session.post(
+                KIE_FILE_UPLOAD_URL,
+                headers=headers,
+                files=files,
+                data=data,
+                timeout=60
+            )
 
     if response.status_code != 200:
         raise Exception(f"File upload failed: {response.status_code} - {response.text}")
 
-    result = response.json()
+    result = json_loads(response.content)
     data = result.get('data', {})
 
     # Kie.ai returns 'downloadUrl', not 'fileUrl'
@@ -117,10 +397,67 @@ def upload_reference_image_to_kie(image_path, api_key):
     if not file_url:
         raise Exception(f"No downloadUrl/fileUrl in response: {result}")
 
+    cache[digest] = {'url': file_url, 'uploaded_at': time.time()}
+    save_upload_cache(cache)
+
     print(f"✅ Uploaded: {file_url}")
     return file_url
 
 
+def task_idempotency_key(record_id, model_name, prompt, aspect_ratio, resolution):
+    """Deterministic key for one scene's generation request"""
+    key_source = f"{record_id}|{model_name}|{aspect_ratio}|{resolution}|{prompt}"
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:32]
+
+
+def load_task_store():
+    """Load the idempotency key -> {task_id, created_at} map"""
+    try:
+        with open(TASK_STORE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_task_store(store):
+    """Write the task store atomically, dropping expired entries"""
+    now = time.time()
+    store = {k: v for k, v in store.items() if now - v.get('created_at', 0) < TASK_STORE_TTL}
+    try:
+        TASK_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = TASK_STORE_PATH.with_name(TASK_STORE_PATH.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(store, f, indent=2)
+        os.replace(tmp_path, TASK_STORE_PATH)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write task store: {e}")
+
+
+def get_stored_task_id(idempotency_key):
+    """Return the task ID created earlier for this key, if still fresh"""
+    with TASK_STORE_LOCK:
+        entry = load_task_store().get(idempotency_key)
+    if entry and time.time() - entry.get('created_at', 0) < TASK_STORE_TTL:
+        return entry.get('task_id')
+    return None
+
+
+def store_task_id(idempotency_key, task_id):
+    """Record a created task so a restart can resume polling it"""
+    with TASK_STORE_LOCK:
+        store = load_task_store()
+        store[idempotency_key] = {'task_id': task_id, 'created_at': time.time()}
+        write_task_store(store)
+
+
+def forget_task_id(idempotency_key):
+    """Drop a stored task that failed or was delivered so the next run creates a new one"""
+    with TASK_STORE_LOCK:
+        store = load_task_store()
+        if store.pop(idempotency_key, None) is not None:
+            write_task_store(store)
+
+
 def truncate_prompt(prompt, max_length=1000):
     """
     Truncate prompt to fit within character limit while preserving key information
@@ -128,14 +465,10 @@ def truncate_prompt(prompt, max_length=1000):
     if len(prompt) <= max_length:
         return prompt
 
-    # Extract key elements (first sentence or two)
-    sentences = prompt.split('.')
-    truncated = ""
-    for sentence in sentences:
-        if len(truncated) + len(sentence) + 1 <= max_length - 50:  # Leave room for ending
-            truncated += sentence + "."
-        else:
-            break
+    # Keep whole sentences: cut after the last period that fits, leaving
+    # room for the ending
+    cut = prompt.rfind('.', 0, max(0, max_length - 50)) + 1
+    truncated = prompt[:cut]
 
     # If still empty or too short, just truncate at max_length
     if not truncated or len(truncated) < 50:
@@ -145,7 +478,8 @@ def truncate_prompt(prompt, max_length=1000):
 
 
 def create_image_generation_task(prompt, model_name, api_key, model_config, reference_image_url=None,
-                                   aspect_ratio='1:1', resolution='1K'):
+                                   aspect_ratio='1:1', resolution='1K', session=SESSION,
+                                   idempotency_key=None, verbose=False):
     """
     Create image generation task on Kie.ai
 
@@ -166,41 +500,32 @@ def create_image_generation_task(prompt, model_name, api_key, model_config, refe
         'Authorization': f'Bearer {api_key}',
         'Content-Type': 'application/json'
     }
+    # Lets the server drop a retried createTask whose first response was lost
+    if idempotency_key:
+        headers['Idempotency-Key'] = idempotency_key
 
-    # Build payload based on model
-    payload = {
-        'model': model_name,
-        'input': {
-            'prompt': prompt,
-            'aspect_ratio': aspect_ratio
-        }
-    }
+    # Payload shape is fixed per model (see make_payload_builder)
+    payload = model_config['build_payload'](prompt, aspect_ratio, resolution, reference_image_url)
 
-    # Add model-specific parameters
-    if model_name == 'nano-banana-pro':
-        if model_config.get('supports_resolution'):
-            payload['input']['resolution'] = resolution
-            print(f"   Resolution: {resolution}")
-        payload['input']['output_format'] = 'png'
-        if reference_image_url and model_config.get('supports_image_input'):
-            payload['input']['image_input'] = [reference_image_url]
-            print(f"   Reference image: ✓")
-
-    elif model_name == 'z-image':
-        # z-image only supports prompt and aspect_ratio
-        # No resolution, no image_input, no other parameters
-        print(f"   Note: z-image doesn't support reference images or resolution")
-        if reference_image_url:
-            print(f"   ⚠️  Reference image ignored (not supported by z-image)")
+    model_input = payload['input']
+    if 'resolution' in model_input:
+        print(f"   Resolution: {resolution}")
+    if 'image_input' in model_input:
+        print(f"   Reference image: ✓")
+    elif reference_image_url:
+        print(f"   ⚠️  Reference image ignored (not supported by {model_name})")
 
     print(f"   Prompt length: {len(prompt)} chars")
-    print(f"   Payload: {json.dumps(payload, indent=2)}")
+    if verbose:
+        print(f"   Payload: {json.dumps(payload, indent=2)}")
 
     try:
-        response = requests.post(
+        response = request_with_retry(
+            'POST',
             KIE_CREATE_TASK_URL,
+            session=session,
             headers=headers,
-            json=payload,
+            data=json_dumps_bytes(payload),
             timeout=30
         )
 
@@ -211,12 +536,13 @@ def create_image_generation_task(prompt, model_name, api_key, model_config, refe
         elif response.status_code == 422:
             raise Exception(f"❌ Invalid parameters: {response.text}")
         elif response.status_code == 429:
-            raise Exception("❌ Rate limited! Please wait a moment and try again.")
+            raise Exception("❌ Rate limited after retries! Please wait a moment and try again.")
         elif response.status_code != 200:
             raise Exception(f"Task creation failed: {response.status_code} - {response.text}")
 
-        result = response.json()
-        print(f"   Response body: {json.dumps(result, indent=2)}")
+        result = json_loads(response.content)
+        if verbose:
+            print(f"   Response body: {json.dumps(result, indent=2)}")
 
         if not result:
             raise Exception("Empty response from API")
@@ -239,7 +565,31 @@ def create_image_generation_task(prompt, model_name, api_key, model_config, refe
         raise Exception(f"Failed to create task: {e}")
 
 
-def poll_task_status(task_id, api_key, max_wait=600):
+def next_poll_delay(poll_count, response=None, data=None):
+    """
+    Seconds to wait before the next status poll
+
+    Uses the server's hint (etaSeconds, X-Poll-Interval, Retry-After) when
+    there is one, otherwise capped exponential backoff on the poll count.
+    """
+    hint = None
+    if data and data.get('etaSeconds') is not None:
+        try:
+            hint = float(data['etaSeconds'])
+        except (TypeError, ValueError):
+            pass
+    if hint is None and response is not None:
+        try:
+            hint = float(response.headers.get('X-Poll-Interval'))
+        except (TypeError, ValueError):
+            hint = retry_after_seconds(response)
+
+    if hint is not None:
+        return min(POLL_MAX_DELAY, max(1.0, hint))
+    return min(POLL_MAX_DELAY, POLL_BASE_DELAY * POLL_BACKOFF ** (poll_count - 1))
+
+
+def poll_task_status(task_id, api_key, max_wait=600, initial_delay=POLL_INITIAL_DELAY, session=SESSION):
     """
     Poll task status until completion
 
@@ -254,22 +604,27 @@ def poll_task_status(task_id, api_key, max_wait=600):
     start_time = time.time()
     poll_count = 0
 
+    # No image finishes this fast, so don't spend requests finding that out
+    time.sleep(min(initial_delay, max_wait))
+
     while time.time() - start_time < max_wait:
         poll_count += 1
 
         try:
-            response = requests.get(
+            response = request_with_retry(
+                'GET',
                 f"{KIE_TASK_STATUS_URL}?taskId={task_id}",
+                session=session,
                 headers=headers,
                 timeout=30
             )
 
             if response.status_code != 200:
                 print(f"⚠️  Poll attempt {poll_count} failed: {response.status_code}")
-                time.sleep(5)
+                time.sleep(next_poll_delay(poll_count, response))
                 continue
 
-            result = response.json()
+            result = json_loads(response.content)
             data = result.get('data', {})
             state = data.get('state')
 
@@ -279,7 +634,7 @@ def poll_task_status(task_id, api_key, max_wait=600):
             if state == 'success':
                 # Parse resultJson (it's a JSON string!)
                 result_json_str = data.get('resultJson', '{}')
-                result_json = json.loads(result_json_str)
+                result_json = json_loads(result_json_str)
                 result_urls = result_json.get('resultUrls', [])
 
                 if not result_urls:
@@ -294,63 +649,239 @@ def poll_task_status(task_id, api_key, max_wait=600):
                 raise Exception(f"Generation failed [{fail_code}]: {fail_msg}")
 
             elif state in ['waiting', 'queuing', 'generating']:
-                # Smart polling interval
-                if elapsed < 30:
-                    time.sleep(3)
-                elif elapsed < 120:
-                    time.sleep(5)
-                else:
-                    time.sleep(10)
+                time.sleep(next_poll_delay(poll_count, response, data))
             else:
                 print(f"⚠️  Unknown state: {state}")
-                time.sleep(5)
+                time.sleep(next_poll_delay(poll_count, response, data))
 
         except requests.exceptions.RequestException as e:
             print(f"⚠️  Network error during poll: {e}")
-            time.sleep(5)
+            time.sleep(next_poll_delay(poll_count))
 
     raise TimeoutError(f"Task did not complete within {max_wait} seconds")
 
 
-def update_airtable_with_image(airtable_token, base_id, record_id, image_url, field_name='start_image'):
+def download_to_tempfile(url, session=SESSION):
     """
-    Update Airtable record with generated image URL
-    Airtable will automatically download and host the file
+    Stream a file to a temporary file in 1 MiB chunks
+
+    iter_content (unlike reading response.raw) turns urllib3 read errors
+    into requests exceptions. The temp file is removed if the download fails.
+
+    Returns: (path, content type)
     """
-    print(f"\n📊 Updating Airtable record: {record_id}")
-    print(f"   Field: {field_name}")
-    print(f"   Image URL: {image_url}")
+    with session.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '').split(';')[0] or 'image/png'
+        suffix = os.path.splitext(urlparse(url).path)[1] or '.png'
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            try:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    tmp.write(chunk)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+
+    return tmp.name, content_type
+
+
+def upload_image_to_airtable(airtable_token, base_id, record_id, image_url, field_name='start_image',
+                             table=None, replace=False, session=SESSION):
+    """
+    Download a generated image and upload it straight into an Airtable attachment
+
+    Kie.ai result URLs are signed and expire, so handing Airtable the URL
+    can leave a broken attachment if Airtable fetches it too late.
 
-    api = Api(airtable_token)
-    table = api.table(base_id, 'Scenes')
+    Airtable's upload endpoint appends to the field, so with replace the
+    existing attachments are cleared through table first. The field must
+    end up holding exactly the new image, otherwise the caller falls back
+    to the replacing URL update.
 
+    Returns: True if uploaded, False if the image should be attached by URL instead
+    """
     try:
-        # Use attachment utility to format URL correctly
-        table.update(record_id, {
-            field_name: [attachment(image_url)]
-        })
+        tmp_path, content_type = download_to_tempfile(image_url, session=session)
+    except (requests.exceptions.RequestException, OSError) as e:
+        print(f"⚠️  Could not download image for direct upload: {e}")
+        return False
+
+    try:
+        if os.path.getsize(tmp_path) > AIRTABLE_UPLOAD_MAX_BYTES:
+            print("   Image is over 5 MB, attaching by URL instead")
+            return False
+
+        with open(tmp_path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+
+        if replace:
+            AIRTABLE_RATE_LIMITER.acquire()
+            table.update(record_id, {field_name: []})
+
+        # Every worker uploads, so stay within Airtable's per-base rate limit
+        response = request_with_retry(
+            'POST',
+            AIRTABLE_UPLOAD_URL.format(base_id=base_id, record_id=record_id, field_name=field_name),
+            session=session,
+            limiter=AIRTABLE_RATE_LIMITER,
+            headers={'Authorization': f'Bearer {airtable_token}'},
+            json={
+                'contentType': content_type,
+                'filename': os.path.basename(urlparse(image_url).path) or f'{record_id}.png',
+                'file': encoded
+            },
+            timeout=60
+        )
+    except (requests.exceptions.RequestException, OSError) as e:
+        print(f"⚠️  Direct Airtable upload failed: {e}")
+        return False
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    if response.status_code != 200:
+        print(f"⚠️  Direct Airtable upload failed: {response.status_code} - {response.text}")
+        return False
+
+    # The response holds the updated field (keyed by field ID)
+    try:
+        attachments = next(iter(json_loads(response.content).get('fields', {}).values()), None)
+    except ValueError:
+        attachments = None
+    if not isinstance(attachments, list) or len(attachments) != 1:
+        count = len(attachments) if isinstance(attachments, list) else 'unknown'
+        print(f"⚠️  {field_name} holds {count} attachment(s) after upload, replacing by URL instead")
+        return False
+
+    print(f"✅ Uploaded image to Airtable record: {record_id}")
+    return True
+
+
+def update_airtable_with_images(table, image_urls, field_name='start_image'):
+    """
+    Update Airtable records with generated image URLs in batches
+    Airtable will automatically download and host the files
+
+    image_urls: dict mapping record_id -> image URL
+    """
+    print(f"\n📊 Updating {len(image_urls)} Airtable record(s)")
+    print(f"   Field: {field_name}")
+
+    # batch_update sends up to 10 records per request
+    updates = [
+        {'id': record_id, 'fields': {field_name: [attachment(image_url)]}}
+        for record_id, image_url in image_urls.items()
+    ]
 
+    try:
+        table.batch_update(updates)
         print(f"✅ Airtable updated successfully")
 
     except Exception as e:
         raise Exception(f"Failed to update Airtable: {e}")
 
 
-def get_scenes_from_airtable(airtable_token, base_id, project_name='Creative Cloner Project'):
+def get_scenes_from_airtable(table, project_name='Creative Cloner Project'):
     """Get all scenes from Airtable for the project"""
     print(f"\n📖 Loading scenes from Airtable...")
     print(f"   Project: {project_name}")
 
-    api = Api(airtable_token)
-    table = api.table(base_id, 'Scenes')
-
+    # Only fetch the columns this tool reads, at the maximum page size
     formula = f"{{Project Name}}='{project_name}'"
-    records = table.all(formula=formula)
+    records = table.all(formula=formula, fields=SCENE_FIELDS, page_size=100)
 
     print(f"✅ Found {len(records)} scene(s)")
     return records
 
 
+def find_reference_images(inputs_dir):
+    """List image files in the inputs folder with a single directory scan"""
+    try:
+        with os.scandir(inputs_dir) as entries:
+            image_files = [
+                Path(entry.path) for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in REFERENCE_IMAGE_EXTENSIONS
+            ]
+    except FileNotFoundError:
+        return []
+
+    return sorted(image_files)
+
+
+def process_scene(record, index, total, config, model_config, reference_image_url,
+                  aspect_ratio='1:1', resolution='1K', session=SESSION, force=False, verbose=False):
+    """
+    Generate the start image for one scene
+
+    With force, a task stored by an earlier run is ignored and a new one
+    is always created.
+
+    Returns: (URL of the generated image or None on failure, idempotency key)
+    """
+    record_id = record['id']
+    fields = record['fields']
+    scene_name = fields.get('scene', f'Scene {index}')
+    prompt = fields.get('start_image_prompt', '')
+
+    print(f"\n{'─' * 80}")
+    print(f"Scene {index}/{total}: {scene_name}")
+    print(f"{'─' * 80}")
+
+    if not prompt:
+        print("⚠️  No image prompt found, skipping...")
+        return None, None
+
+    idempotency_key = task_idempotency_key(record_id, model_config['name'], prompt, aspect_ratio, resolution)
+    if force:
+        # A regeneration must not be deduplicated into the previous task
+        idempotency_key = hashlib.sha256(f"{idempotency_key}|{time.time_ns()}".encode('utf-8')).hexdigest()[:32]
+
+    try:
+        # Resume a task created by an interrupted run, or create a new one
+        task_id = None if force else get_stored_task_id(idempotency_key)
+        if task_id:
+            print(f"♻️  Resuming existing task: {task_id}")
+        else:
+            task_id = create_image_generation_task(
+                prompt=prompt,
+                model_name=model_config['name'],
+                api_key=config['kie_api_key'],
+                model_config=model_config,
+                reference_image_url=reference_image_url,
+                aspect_ratio=aspect_ratio,
+                resolution=resolution,
+                session=session,
+                idempotency_key=idempotency_key,
+                verbose=verbose
+            )
+            store_task_id(idempotency_key, task_id)
+
+        # Poll for completion (a timed-out task may still finish, so keep it)
+        try:
+            result_urls = poll_task_status(task_id, config['kie_api_key'], session=session)
+        except TimeoutError:
+            raise
+        except Exception:
+            forget_task_id(idempotency_key)
+            raise
+
+        if not result_urls:
+            print("⚠️  No result URLs returned")
+            return None, idempotency_key
+
+        # Airtable gets the first result URL; the stored task is kept until
+        # the image has been written there, in case the run is interrupted
+        print(f"   Image URL: {result_urls[0]}")
+        return result_urls[0], idempotency_key
+
+    except Exception as e:
+        print(f"❌ Error processing scene {index} ({scene_name}): {e}")
+        return None, idempotency_key
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate images using Kie.ai and upload to Airtable',
@@ -402,6 +933,33 @@ Example:
         action='store_true',
         help='Skip cost approval prompt (use with caution!)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=5,
+        help='Number of scenes to generate at the same time (default: 5)'
+    )
+    parser.add_argument(
+        '--max-rps',
+        type=float,
+        default=REQUESTS_PER_SECOND,
+        help=f'Max Kie.ai requests per second across all workers (default: {REQUESTS_PER_SECOND})'
+    )
+    parser.add_argument(
+        '--attach-by-url',
+        action='store_true',
+        help='Let Airtable fetch images from the Kie.ai URL instead of uploading them directly'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print full request payloads and API responses'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate scenes that already have a start image'
+    )
     parser.add_argument(
         '--test-mode',
         action='store_true',
@@ -423,19 +981,21 @@ Example:
     print(f"\n📋 Model: {model_config['name']}")
     print(f"   Cost: ${model_config['cost']} per image")
 
+    # One Airtable client and table for every read and write in this run
+    api = Api(config['airtable_token'])
+    table = api.table(config['airtable_base_id'], 'Scenes')
+
     # Load scenes from Airtable (or use test mode)
     if args.test_mode:
         print("\n🧪 TEST MODE - Creating simple test prompt")
         # Create a simple test record
-        api = Api(config['airtable_token'])
-        table = api.table(config['airtable_base_id'], 'Scenes')
 
         # Create or update test record
         test_prompt = "A young man smiling at the camera, indoor setting, natural lighting"
 
         # Check if test record exists
         formula = f"{{Project Name}}='TEST-{args.project_name}'"
-        existing = table.all(formula=formula)
+        existing = table.all(formula=formula, fields=SCENE_FIELDS, page_size=100)
 
         if existing:
             print(f"   Found existing test record, using it")
@@ -449,21 +1009,33 @@ Example:
                 'video_prompt': 'Test video prompt'
             })
             scenes = [test_record]
+            invalidate_table(table)
 
         print(f"   Test prompt: {test_prompt}")
         print(f"   Prompt length: {len(test_prompt)} chars")
     else:
-        scenes = get_scenes_from_airtable(
-            config['airtable_token'],
-            config['airtable_base_id'],
-            args.project_name
-        )
+        scenes = get_scenes_from_airtable(table, args.project_name)
 
         if not scenes:
             print("❌ No scenes found in Airtable!")
             print("   Run log_to_airtable.py first to create scene records")
             sys.exit(1)
 
+    # Scenes that already have a start image cost nothing to skip, which
+    # makes re-running after a crash or partial failure cheap
+    skipped = []
+    if not args.force:
+        skipped = [record for record in scenes if record['fields'].get('start_image')]
+        scenes = [record for record in scenes if not record['fields'].get('start_image')]
+        if skipped:
+            print(f"\n⏭️  Skipping {len(skipped)} scene(s) that already have a start image (use --force to regenerate)")
+            for record in skipped:
+                print(f"   - {record['fields'].get('scene', record['id'])}")
+
+        if not scenes:
+            print("\n✅ All scenes already have start images, nothing to generate")
+            return
+
     # Calculate total cost
     total_cost = len(scenes) * model_config['cost']
     print(f"\n💰 Cost Estimate:")
@@ -482,8 +1054,7 @@ Example:
     if not reference_image_path and not args.test_mode:
         # Auto-detect from inputs/ folder
         inputs_dir = Path(__file__).parent.parent / 'inputs'
-        image_files = list(inputs_dir.glob('*.jpg')) + list(inputs_dir.glob('*.png')) + list(inputs_dir.glob('*.jpeg'))
-        image_files = [f for f in image_files if not f.name.endswith('.mp4')]
+        image_files = find_reference_images(inputs_dir)
 
         if image_files:
             reference_image_path = str(image_files[0])
@@ -512,77 +1083,126 @@ Example:
         print("✅ Dry run complete")
         return
 
-    # Upload reference image to Kie if provided (skip in test mode)
-    reference_image_url = None
-    if reference_image_path and not args.test_mode:
+    # One connection pool and request budget for all Kie.ai calls
+    RATE_LIMITER.rate = max(0.1, args.max_rps)
+    concurrency = max(1, args.concurrency)
+    session = create_session(pool_size=max(32, concurrency))
+
+    # Upload reference image to Kie if provided (skip in test mode). The
+    # upload runs on the worker pool alongside the first scenes instead of
+    # delaying all of them; only models that use the image wait for it.
+    upload_reference = bool(reference_image_path) and not args.test_mode
+    if upload_reference and not model_config['supports_image_input']:
+        print(f"\n⚠️  {model_config['name']} doesn't support reference images, skipping upload")
+        upload_reference = False
+
+    def upload_reference_image():
         try:
-            reference_image_url = upload_reference_image_to_kie(
+            return upload_reference_image_to_kie(
                 reference_image_path,
-                config['kie_api_key']
+                config['kie_api_key'],
+                session=session
             )
         except Exception as e:
             print(f"❌ Failed to upload reference image: {e}")
             print("   Continuing without reference image...")
+            return None
 
     # Process each scene
     print(f"\n{'=' * 80}")
     print(f"🚀 Starting generation for {len(scenes)} scene(s)")
     print(f"{'=' * 80}")
 
-    successful = 0
-    failed = 0
-
-    for i, record in enumerate(scenes, 1):
-        record_id = record['id']
-        fields = record['fields']
-        scene_name = fields.get('scene', f'Scene {i}')
-        prompt = fields.get('start_image_prompt', '')
-
-        print(f"\n{'─' * 80}")
-        print(f"Scene {i}/{len(scenes)}: {scene_name}")
-        print(f"{'─' * 80}")
-
-        if not prompt:
-            print("⚠️  No image prompt found, skipping...")
-            failed += 1
-            continue
-
-        try:
-            # Create generation task
-            task_id = create_image_generation_task(
-                prompt=prompt,
-                model_name=args.model,
-                api_key=config['kie_api_key'],
-                model_config=model_config,
-                reference_image_url=reference_image_url,
-                aspect_ratio=args.aspect_ratio or model_config['default_aspect_ratio'],
-                resolution=args.resolution
-            )
-
-            # Poll for completion
-            result_urls = poll_task_status(task_id, config['kie_api_key'])
+    # Scenes are independent and mostly spent waiting on Kie.ai, so run
+    # several at once; the pool size keeps us within the API rate limit
+    def run_scene(numbered_record):
+        i, record = numbered_record
+        reference_image_url = reference_future.result() if reference_future else None
+        image_url, idempotency_key = process_scene(
+            record, i, len(scenes), config, model_config, reference_image_url,
+            aspect_ratio=args.aspect_ratio or model_config['default_aspect_ratio'],
+            resolution=args.resolution,
+            session=session,
+            force=args.force,
+            verbose=args.verbose
+        )
 
-            # Update Airtable with the first result URL
-            if result_urls:
-                update_airtable_with_image(
+        # Copy the image into Airtable from the worker, so it overlaps
+        # with the other scenes; anything not uploaded is attached by URL
+        uploaded = False
+        if image_url and not args.attach_by_url:
+            try:
+                uploaded = upload_image_to_airtable(
                     config['airtable_token'],
                     config['airtable_base_id'],
-                    record_id,
-                    result_urls[0],
-                    field_name='start_image'
+                    record['id'],
+                    image_url,
+                    field_name='start_image',
+                    table=table,
+                    replace=bool(record['fields'].get('start_image')),
+                    session=session
                 )
-                successful += 1
-            else:
-                print("⚠️  No result URLs returned")
-                failed += 1
+            except Exception as e:
+                print(f"⚠️  Direct Airtable upload failed: {e}")
+        if uploaded:
+            forget_task_id(idempotency_key)
+        return image_url, idempotency_key, uploaded
+
+    # Write finished images to Airtable in batches while the remaining
+    # scenes are still generating, instead of waiting for all of them
+    successful = 0
+    failed = 0
+    pending = {}
+    pending_keys = []
 
+    def flush_pending():
+        nonlocal successful, failed
+        if not pending:
+            return
+        try:
+            update_airtable_with_images(table, pending, field_name='start_image')
+            successful += len(pending)
+            # Delivered, so a later run (or --force) starts a fresh task
+            for idempotency_key in pending_keys:
+                forget_task_id(idempotency_key)
         except Exception as e:
-            print(f"❌ Error processing scene: {e}")
-            failed += 1
+            print(f"❌ {e}")
+            failed += len(pending)
+        pending.clear()
+        pending_keys.clear()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Submitted first, so it starts before any scene waits on it
+        reference_future = executor.submit(upload_reference_image) if upload_reference else None
+        futures = {
+            executor.submit(run_scene, numbered_record): numbered_record[1]['id']
+            for numbered_record in enumerate(scenes, 1)
+        }
+        for future in as_completed(futures):
+            # One scene failing unexpectedly mustn't abort the run and drop
+            # the images already waiting to be written to Airtable
+            try:
+                image_url, idempotency_key, uploaded = future.result()
+            except Exception as e:
+                print(f"❌ Error processing scene {futures[future]}: {e}")
+                failed += 1
+                continue
+            if not image_url:
+                failed += 1
+                continue
+            if uploaded:
+                successful += 1
+                continue
+
+            pending[futures[future]] = image_url
+            pending_keys.append(idempotency_key)
+            if len(pending) >= AIRTABLE_BATCH_SIZE:
+                flush_pending()
+
+    flush_pending()
 
-        # Small delay between scenes to avoid rate limits
-        if i < len(scenes):
-            time.sleep(2)
+    # New start images change which scenes generate_videos.py will pick up
+    invalidate_table(table)
 
     # Summary
     print(f"\n{'=' * 80}")
@@ -590,6 +1210,7 @@ Example:
     print(f"{'=' * 80}")
     print(f"✅ Successful: {successful}")
     print(f"❌ Failed: {failed}")
+    print(f"⏭️  Skipped (already generated): {len(skipped)}")
     print(f"💰 Actual cost: ${successful * model_config['cost']:.4f}")
     print(f"{'=' * 80}")
 
@@ -22,16 +22,32 @@ import os
 import sys
 import json
 import time
+import logging
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 from pyairtable import Api
 
+from normalize_clip import normalize_clip, sidecar_path
+from _airtable_cache import DEFAULT_CACHE_TTL, cached_all, invalidate_table
+
+# Optional: faster JSON decoding for status polls
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Fix Windows console encoding
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
+logger = logging.getLogger(__name__)
+
 # Model configurations
 MODELS = {
     'sora-2': {
@@ -42,6 +58,7 @@ MODELS = {
         'default_duration': '10',  # 10 seconds
         'supports_watermark_removal': True,
         'frame_options': ['10', '15'],  # 10s or 15s
+        'aspect_ratio_options': ['portrait', 'landscape'],
         'api_type': 'sora',  # API type for payload formatting
         'description': 'OpenAI Sora 2 - Image-to-video, good quality'
     },
@@ -73,6 +90,63 @@ MODELS = {
 KIE_CREATE_TASK_URL = 'https://api.kie.ai/api/v1/jobs/createTask'
 KIE_GET_TASK_URL = 'https://api.kie.ai/api/v1/jobs/recordInfo'
 
+# Airtable accepts at most 10 records per batch request
+AIRTABLE_BATCH_SIZE = 10
+
+# Scene columns read from Airtable
+SCENE_FIELDS = ['scene', 'start_image', 'video_prompt']
+
+# Video downloads: 1 MiB reads; files of 8 MB+ are fetched as 4 parallel
+# ranges; up to 4 videos download at once alongside generation
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_PARTS = 4
+PARALLEL_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024
+DOWNLOAD_WORKERS = 4
+
+# Scenes generated at the same time unless --concurrency says otherwise
+DEFAULT_CONCURRENCY = 5
+
+
+def mount_http_adapter(session, concurrency):
+    """
+    Size the session's connection pool for the threads that share it
+
+    Each generation worker holds one connection (createTask, then polls) and
+    each download worker up to DOWNLOAD_PARTS range connections; a smaller
+    pool would discard keep-alive connections instead of reusing them.
+    Retry only covers idempotent requests (urllib3 skips POST), so
+    createTask is never sent twice.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=concurrency + DOWNLOAD_WORKERS * DOWNLOAD_PARTS,
+        max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+# Shared HTTP session: keep-alive reuse across task creation, the
+# 20+ status polls per video and downloads
+SESSION = requests.Session()
+mount_http_adapter(SESSION, DEFAULT_CONCURRENCY)
+
+# Status polling: 2s → 3s → 4.5s → 6.75s ... capped at 30s
+POLL_INITIAL_DELAY = 2.0
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 30.0
+
+# Failed polls back off separately: 2s → 4s → 8s ... capped at 60s
+ERROR_INITIAL_DELAY = 2.0
+ERROR_MAX_DELAY = 60.0
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def load_config():
     """Load API keys from .env file"""
@@ -102,34 +176,46 @@ def load_config():
     }
 
 
-def get_scenes_from_airtable(airtable_token, base_id, project_name):
+@dataclass
+class SceneJob:
+    """Everything needed to generate one scene's video, read once from its record"""
+    record_id: str
+    image_url: str
+    prompt: str
+    name: str
+
+
+def get_scenes_from_airtable(table, project_name, use_cache=True, cache_ttl=DEFAULT_CACHE_TTL):
     """
     Fetch scenes from Airtable that have start_image but no scene_video
 
-    Returns: List of records with their IDs, scene names, image URLs, and video prompts
+    Returns: List of SceneJob, one per scene
     """
     print(f"\n📖 Loading scenes from Airtable...")
     print(f"   Project: {project_name}")
 
-    api = Api(airtable_token)
-    table = api.table(base_id, 'Scenes')
-
-    # Get all records for this project
-    formula = f"{{Project Name}}='{project_name}'"
-    all_records = table.all(formula=formula)
-
-    if not all_records:
-        return []
+    # Let Airtable do the filtering: only this project's scenes that have a
+    # start_image but no scene_video, and only the columns used here
+    formula = (
+        f"AND({{Project Name}}='{project_name}', "
+        f"{{start_image}}!='', {{scene_video}}='')"
+    )
+    records = cached_all(table, formula=formula, fields=SCENE_FIELDS, page_size=95,
+                         ttl=cache_ttl, use_cache=use_cache)
 
-    # Filter to only records that have start_image but no scene_video
     scenes = []
-    for record in all_records:
+    for i, record in enumerate(records, 1):
         fields = record['fields']
-        has_image = 'start_image' in fields and fields['start_image']
-        has_video = 'scene_video' in fields and fields['scene_video']
-
-        if has_image and not has_video:
-            scenes.append(record)
+        try:
+            image_url = get_image_url_from_record(record)
+        except Exception:
+            image_url = ''
+        scenes.append(SceneJob(
+            record_id=record['id'],
+            image_url=image_url,
+            prompt=fields.get('video_prompt', ''),
+            name=fields.get('scene', f'Scene {i}')
+        ))
 
     print(f"✅ Found {len(scenes)} scene(s) ready for video generation")
     return scenes
@@ -159,14 +245,10 @@ def truncate_prompt(prompt, max_length=10000):
     if len(prompt) <= max_length:
         return prompt
 
-    # Extract key elements (first sentence or two)
-    sentences = prompt.split('.')
-    truncated = ""
-    for sentence in sentences:
-        if len(truncated) + len(sentence) + 1 <= max_length - 50:  # Leave room for ending
-            truncated += sentence + "."
-        else:
-            break
+    # Keep whole sentences: cut after the last period that fits, leaving
+    # room for the ending
+    cut = prompt.rfind('.', 0, max(0, max_length - 50)) + 1
+    truncated = prompt[:cut]
 
     # If still empty or too short, just truncate at max_length
     if not truncated or len(truncated) < 50:
@@ -175,6 +257,34 @@ def truncate_prompt(prompt, max_length=10000):
     return truncated.strip()
 
 
+def validate_task_params(prompt, image_url, aspect_ratio, n_frames, model_config):
+    """
+    Check task parameters locally before spending a createTask request on them
+
+    Only options the model config lists (frame_options, aspect_ratio_options)
+    are checked against it.
+
+    Raises: ValueError if a parameter would be rejected by the API
+    """
+    if not prompt or not prompt.strip():
+        raise ValueError("Video prompt is empty")
+
+    if not image_url or not image_url.startswith(('http://', 'https://')):
+        raise ValueError(f"Image URL must be http(s): {image_url!r}")
+
+    aspect_ratio_options = model_config.get('aspect_ratio_options')
+    if aspect_ratio_options and aspect_ratio not in aspect_ratio_options:
+        raise ValueError(
+            f"Unsupported aspect ratio {aspect_ratio!r} (expected one of: {', '.join(aspect_ratio_options)})"
+        )
+
+    frame_options = model_config.get('frame_options')
+    if frame_options and str(n_frames) not in frame_options:
+        raise ValueError(
+            f"Unsupported duration {n_frames!r} (expected one of: {', '.join(frame_options)})"
+        )
+
+
 def create_video_generation_task(prompt, image_url, model_name, api_key, model_config,
                                    aspect_ratio='landscape', n_frames='10', remove_watermark=True):
     """
@@ -183,6 +293,8 @@ def create_video_generation_task(prompt, image_url, model_name, api_key, model_c
 
     Returns: taskId (str)
     """
+    validate_task_params(prompt, image_url, aspect_ratio, n_frames, model_config)
+
     print(f"\n🎬 Creating video generation task...")
     print(f"   Model: {model_name}")
 
@@ -194,21 +306,28 @@ def create_video_generation_task(prompt, image_url, model_name, api_key, model_c
         'Content-Type': 'application/json'
     }
 
+    print(f"   Image URL: {image_url[:60]}...")
+    print(f"   Aspect Ratio: {aspect_ratio}")
+    print(f"   Duration: {n_frames}s")
+
+    # Truncate prompt if needed for model limits
+    # (Kling 3.0 has a 500 char limit per prompt)
+    if api_type == 'kling3':
+        max_prompt_length = 500
+    else:
+        max_prompt_length = model_config.get('max_prompt_length', 10000)
+    original_length = len(prompt)
+    if original_length > max_prompt_length:
+        prompt = truncate_prompt(prompt, max_prompt_length)
+    prompt_length = len(prompt)
+    if prompt_length != original_length:
+        print(f"   ⚠️  Prompt truncated: {original_length} → {prompt_length} chars")
+
     # Build payload based on API type
     if api_type == 'kling3':
         # Kling 3.0 uses a specific format with multi_shots, sound, and other parameters
         mode = model_config.get('default_mode', 'std')
         print(f"   Mode: {mode}")
-        print(f"   Image URL: {image_url[:60]}...")
-        print(f"   Aspect Ratio: {aspect_ratio}")
-        print(f"   Duration: {n_frames}s")
-
-        # Truncate prompt if needed
-        max_prompt_length = model_config.get('max_prompt_length', 10000)
-        original_length = len(prompt)
-        if original_length > 500:  # Kling 3.0 has 500 char limit per prompt
-            prompt = truncate_prompt(prompt, 500)
-            print(f"   ⚠️  Prompt truncated: {original_length} → {len(prompt)} chars")
 
         payload = {
             'model': model_name,
@@ -222,21 +341,9 @@ def create_video_generation_task(prompt, image_url, model_name, api_key, model_c
                 'prompt': prompt
             }
         }
-        print(f"   Prompt length: {len(prompt)} chars")
 
     else:
         # Sora 2 and similar models use full parameters
-        print(f"   Image URL: {image_url[:60]}...")
-        print(f"   Aspect Ratio: {aspect_ratio}")
-        print(f"   Duration: {n_frames}s")
-
-        # Truncate prompt if needed for model limits
-        max_prompt_length = model_config.get('max_prompt_length', 10000)
-        original_length = len(prompt)
-        if original_length > max_prompt_length:
-            prompt = truncate_prompt(prompt, max_prompt_length)
-            print(f"   ⚠️  Prompt truncated: {original_length} → {len(prompt)} chars")
-
         payload = {
             'model': model_name,
             'input': {
@@ -248,12 +355,15 @@ def create_video_generation_task(prompt, image_url, model_name, api_key, model_c
                 'upload_method': 's3'
             }
         }
-        print(f"   Prompt length: {len(prompt)} chars")
 
-    print(f"   Payload: {json.dumps(payload, indent=2)}")
+    print(f"   Prompt length: {prompt_length} chars")
+
+    # Full payload dumps only when running with --verbose
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   Payload: %s", json.dumps(payload, indent=2))
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             KIE_CREATE_TASK_URL,
             headers=headers,
             json=payload,
@@ -272,7 +382,8 @@ def create_video_generation_task(prompt, image_url, model_name, api_key, model_c
             raise Exception(f"Task creation failed: {response.status_code} - {response.text}")
 
         result = response.json()
-        print(f"   Response body: {json.dumps(result, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   Response body: %s", json.dumps(result, indent=2))
 
         if not result:
             raise Exception("Empty response from API")
@@ -312,34 +423,41 @@ def poll_task_status(task_id, api_key, max_wait=900):
 
     start_time = time.time()
     poll_count = 0
+    error_count = 0
+
+    def error_delay():
+        return min(ERROR_MAX_DELAY, ERROR_INITIAL_DELAY * (2 ** (error_count - 1)))
 
     while time.time() - start_time < max_wait:
         poll_count += 1
         elapsed = int(time.time() - start_time)
 
         try:
-            response = requests.get(
+            response = SESSION.get(
                 f"{KIE_GET_TASK_URL}?taskId={task_id}",
                 headers=headers,
                 timeout=30
             )
 
             if response.status_code != 200:
+                error_count += 1
                 print(f"   ⚠️  Poll failed: {response.status_code}")
-                time.sleep(5)
+                time.sleep(error_delay())
                 continue
 
-            result = response.json()
+            result = json_loads(response.content)
             data = result.get('data', {})
             state = data.get('state')
 
-            print(f"   [{elapsed}s] Poll #{poll_count}: state={state}")
+            # Per-poll progress only with --verbose; with several scenes in
+            # flight these lines would otherwise interleave every few seconds
+            logger.debug("   [%ds] Poll #%d: state=%s", elapsed, poll_count, state)
 
             if state == 'success':
                 # Parse resultJson
                 result_json = data.get('resultJson', '{}')
                 if isinstance(result_json, str):
-                    result_data = json.loads(result_json)
+                    result_data = json_loads(result_json)
                 else:
                     result_data = result_json
 
@@ -352,80 +470,298 @@ def poll_task_status(task_id, api_key, max_wait=900):
                 fail_code = data.get('failCode', 'N/A')
                 raise Exception(f"Generation failed: [{fail_code}] {fail_msg}")
 
-            # Smart polling interval based on elapsed time
-            if elapsed < 60:
-                time.sleep(10)  # Poll every 10s for first minute
-            elif elapsed < 180:
-                time.sleep(15)  # Poll every 15s for next 2 minutes
-            else:
-                time.sleep(30)  # Poll every 30s after 3 minutes
+            # Poll often at first to catch quick completions, then taper off
+            error_count = 0
+            time.sleep(min(POLL_MAX_DELAY, POLL_INITIAL_DELAY * (POLL_BACKOFF ** (poll_count - 1))))
 
         except requests.exceptions.RequestException as e:
+            error_count += 1
             print(f"   ⚠️  Network error: {e}")
-            time.sleep(5)
+            time.sleep(error_delay())
             continue
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # json and orjson decode errors
+            error_count += 1
             print(f"   ⚠️  JSON parse error: {e}")
-            time.sleep(5)
+            time.sleep(error_delay())
             continue
 
     raise Exception(f"Task did not complete within {max_wait}s timeout")
 
 
-def update_airtable_record(record_id, video_url, airtable_token, base_id):
+def update_airtable_records(video_urls, table):
     """
-    Update Airtable record with generated video URL
+    Update Airtable records with generated video URLs in one batch request
 
-    Airtable automatically downloads the file from the URL
+    video_urls: dict mapping record_id -> video URL (at most 10 entries)
+
+    Airtable automatically downloads the files from the URLs
     """
-    print(f"\n📊 Updating Airtable record: {record_id}")
+    print(f"\n📊 Updating {len(video_urls)} Airtable record(s)")
     print(f"   Field: scene_video")
-    print(f"   Video URL: {video_url[:60]}...")
-
-    api = Api(airtable_token)
-    table = api.table(base_id, 'Scenes')
 
     try:
-        # Update with attachment URL
+        # Update with attachment URLs
         # Airtable expects: {'field_name': [{'url': 'http://...'}]}
-        table.update(record_id, {
-            'scene_video': [{'url': video_url}]
-        })
+        table.batch_update([
+            {'id': record_id, 'fields': {'scene_video': [{'url': video_url}]}}
+            for record_id, video_url in video_urls.items()
+        ])
         print(f"✅ Airtable updated successfully")
     except Exception as e:
         raise Exception(f"Failed to update Airtable: {e}")
+    finally:
+        # Updated scenes are no longer ready for generation
+        invalidate_table(table)
+
+
+def download_range(video_url, output_path, start, end):
+    """Download bytes start..end (inclusive) of a file into the same offset of output_path"""
+    headers = {'Range': f'bytes={start}-{end}'}
+    with SESSION.get(video_url, headers=headers, stream=True, timeout=120) as response:
+        if response.status_code != 206:
+            raise Exception(f"Range request not honoured: {response.status_code}")
+
+        with open(output_path, 'r+b') as f:
+            f.seek(start)
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+
+def download_in_ranges(video_url, output_path, total_size, parts=DOWNLOAD_PARTS):
+    """Download a file as several parallel HTTP range requests"""
+    # Preallocate so every part can write at its own offset
+    with open(output_path, 'wb') as f:
+        f.truncate(total_size)
+
+    part_size = -(-total_size // parts)
+    ranges = [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        for future in [executor.submit(download_range, video_url, output_path, s, e) for s, e in ranges]:
+            future.result()
+
+
+def download_single_stream(video_url, output_path, resume_from=0):
+    """Download a file over one connection, appending from resume_from if given"""
+    headers = {'Range': f'bytes={resume_from}-'} if resume_from else {}
+    with SESSION.get(video_url, headers=headers, stream=True, timeout=120) as response:
+        response.raise_for_status()
+        # A 200 means the server ignored the Range header, so start over
+        mode = 'ab' if resume_from and response.status_code == 206 else 'wb'
+        with open(output_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+
+def etag_path(video_path):
+    """Path of the sidecar file recording the ETag a video was downloaded with"""
+    return video_path.with_name(f"{video_path.name}.etag")
+
+
+def read_etag(video_path):
+    """Return the recorded ETag for a downloaded video, or None"""
+    try:
+        return etag_path(video_path).read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+
+def is_already_downloaded(output_path, total_size, etag):
+    """
+    Check whether output_path already holds the remote file
+
+    A matching ETag sidecar wins (the clip may have been normalized since,
+    changing its size); otherwise the size must match Content-Length.
+
+    Returns: True if the download can be skipped
+    """
+    try:
+        local_size = output_path.stat().st_size
+    except OSError:
+        return False
+
+    if etag:
+        recorded = read_etag(output_path)
+        if recorded is not None:
+            return recorded == etag
+
+    return total_size > 0 and local_size == total_size
 
 
 def download_video(video_url, output_path):
     """
     Download video from URL to local file
 
+    Large files are fetched as parallel range requests when the server
+    supports them, otherwise over a single connection. A file that is
+    already on disk is skipped, and a partial .part file left by an
+    interrupted run is resumed where it stopped.
+
     Returns: Local file path
     """
     print(f"\n💾 Downloading video...")
     print(f"   From: {video_url[:60]}...")
     print(f"   To: {output_path}")
 
-    try:
-        response = requests.get(video_url, stream=True, timeout=120)
-        response.raise_for_status()
+    # Create parent directory if needed
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create parent directory if needed
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Download to a temp name so an interrupted download never looks complete
+    tmp_path = output_path.with_name(output_path.name + '.part')
+    resume_from = 0
 
-        # Download in chunks
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+    try:
+        total_size = 0
+        supports_ranges = False
+        etag = None
+        try:
+            head = SESSION.head(video_url, allow_redirects=True, timeout=30)
+            if head.status_code == 200:
+                total_size = int(head.headers.get('Content-Length', 0))
+                supports_ranges = head.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                etag = head.headers.get('ETag')
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+
+        if is_already_downloaded(output_path, total_size, etag):
+            print("✅ Already downloaded")
+            return output_path
+
+        # Only resume a partial file whose recorded ETag proves it came from
+        # this same remote file; without an ETag there's no such proof
+        if etag is not None and supports_ranges and total_size and read_etag(tmp_path) == etag:
+            try:
+                resume_from = tmp_path.stat().st_size
+            except OSError:
+                pass
+            if resume_from >= total_size:
+                resume_from = 0
+
+        if not resume_from:
+            # Start over: drop any stale partial left by a different clip
+            for stale in (tmp_path, etag_path(tmp_path)):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+        downloaded = False
+        if resume_from:
+            print(f"   Resuming from {resume_from / (1024 * 1024):.2f} MB")
+            download_single_stream(video_url, tmp_path, resume_from=resume_from)
+            downloaded = True
+        elif supports_ranges and total_size >= PARALLEL_DOWNLOAD_MIN_SIZE:
+            try:
+                download_in_ranges(video_url, tmp_path, total_size)
+                downloaded = True
+            except Exception as e:
+                print(f"   ⚠️  Parallel download failed ({e}), retrying as a single stream")
+
+        if not downloaded:
+            if etag:
+                etag_path(tmp_path).write_text(etag, encoding='utf-8')
+            download_single_stream(video_url, tmp_path)
+
+        os.replace(tmp_path, output_path)
+
+        # Record what we downloaded, and drop any normalization record
+        # left over from a previous clip at this path
+        if etag:
+            etag_path(output_path).write_text(etag, encoding='utf-8')
+        for stale in (etag_path(tmp_path), sidecar_path(output_path)):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
 
         file_size = output_path.stat().st_size / (1024 * 1024)  # MB
         print(f"✅ Downloaded: {file_size:.2f} MB")
         return output_path
 
     except Exception as e:
+        # Keep a single-stream partial so the next run can resume it; a
+        # preallocated parallel download can't be resumed
+        if not resume_from and not etag_path(tmp_path).exists():
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
         raise Exception(f"Failed to download video: {e}")
 
 
+def scene_video_path(outputs_dir, index, scene):
+    """Local path a scene's video is downloaded to"""
+    return outputs_dir / f"scene_{index}_{scene.name.replace(' ', '_')[:30]}.mp4"
+
+
+def save_scene_video(video_url, video_path, normalize=True):
+    """
+    Download a generated video and optionally normalize it
+
+    Returns: True on success
+    """
+    try:
+        download_video(video_url, video_path)
+        if normalize:
+            normalize_clip(video_path)
+        return True
+    except Exception as e:
+        print(f"❌ Error downloading {video_path.name}: {e}")
+        return False
+
+
+def process_scene(scene, index, total, config, model_config, aspect_ratio='landscape',
+                  n_frames='10', remove_watermark=True):
+    """
+    Generate the video for one scene
+
+    Returns: the video URL on success, False on failure, None if the scene was skipped
+    """
+    scene_name = scene.name
+    print("\n" + "-" * 80)
+    print(f"Scene {index}/{total}: {scene_name}")
+    print("-" * 80)
+
+    if not scene.image_url:
+        print("❌ Error getting scene data: No image found in start_image field")
+        return False
+
+    if not scene.prompt:
+        print("⚠️  No video_prompt found, skipping...")
+        return None
+
+    try:
+        # Create generation task
+        task_id = create_video_generation_task(
+            prompt=scene.prompt,
+            image_url=scene.image_url,
+            model_name=model_config['name'],
+            api_key=config['kie_api_key'],
+            model_config=model_config,
+            aspect_ratio=aspect_ratio,
+            n_frames=n_frames,
+            remove_watermark=remove_watermark
+        )
+
+        # Poll for completion
+        result_urls = poll_task_status(task_id, config['kie_api_key'])
+
+        if not result_urls:
+            raise Exception("No result URLs returned")
+
+        video_url = result_urls[0]
+        print(f"   Video URL: {video_url[:60]}...")
+
+        # Downloading and the Airtable update are left to the caller
+        return video_url
+
+    except Exception as e:
+        print(f"❌ Error generating video for scene {index} ({scene_name}): {e}")
+        return False
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate videos from images using AI models via Kie.ai API',
@@ -480,6 +816,28 @@ Example Usage:
         action='store_true',
         help='Skip cost approval prompt (use with caution!)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Number of videos to generate at the same time (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always fetch scenes from Airtable instead of using the local cache'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f'Seconds to reuse cached Airtable scenes (default: {DEFAULT_CACHE_TTL})'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print every status poll, full request payloads and API responses'
+    )
     parser.add_argument(
         '--test-mode',
         action='store_true',
@@ -490,9 +848,23 @@ Example Usage:
         action='store_true',
         help='Skip downloading videos locally (only update Airtable)'
     )
+    parser.add_argument(
+        '--skip-normalize',
+        action='store_true',
+        help='Keep downloaded clips as generated instead of normalizing them for fast combining'
+    )
 
     args = parser.parse_args()
 
+    # Configure only this script's logger: the root logger would also turn
+    # on urllib3/pyairtable debug output, and its stderr handler would split
+    # our progress lines away from the printed ones on stdout
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    logger.propagate = False
+
     print("=" * 80)
     print("🎬 Creative Cloner - Video Generator")
     print("=" * 80)
@@ -507,6 +879,10 @@ Example Usage:
     print(f"   Cost: ${model_config['cost']} per video (estimated)")
     print(f"   Duration: {args.duration}s")
 
+    # One Airtable client (and connection pool) for the whole run
+    api = Api(config['airtable_token'])
+    table = api.table(config['airtable_base_id'], 'Scenes')
+
     # Load scenes from Airtable (or use test mode)
     if args.test_mode:
         print("\n🧪 TEST MODE - Using test data")
@@ -516,9 +892,10 @@ Example Usage:
         sys.exit(1)
     else:
         scenes = get_scenes_from_airtable(
-            config['airtable_token'],
-            config['airtable_base_id'],
-            args.project_name
+            table,
+            args.project_name,
+            use_cache=not args.no_cache,
+            cache_ttl=args.cache_ttl
         )
 
         if not scenes:
@@ -544,14 +921,12 @@ Example Usage:
     if args.dry_run:
         print("\n🔍 DRY RUN MODE - No actual API calls will be made")
         print("\n" + "=" * 80)
-        for i, record in enumerate(scenes, 1):
-            fields = record['fields']
-            image_url = get_image_url_from_record(record)
+        for i, scene in enumerate(scenes, 1):
             print(f"\nScene {i}:")
-            print(f"  ID: {record['id']}")
-            print(f"  Name: {fields.get('scene', 'N/A')}")
-            print(f"  Image URL: {image_url[:60]}...")
-            print(f"  Video Prompt: {fields.get('video_prompt', 'N/A')[:100]}...")
+            print(f"  ID: {scene.record_id}")
+            print(f"  Name: {scene.name}")
+            print(f"  Image URL: {scene.image_url[:60]}...")
+            print(f"  Video Prompt: {(scene.prompt or 'N/A')[:100]}...")
             print(f"  Would generate with model: {args.model}")
             print(f"  Would update Airtable field: scene_video")
             if not args.skip_download:
@@ -565,80 +940,80 @@ Example Usage:
     print(f"🚀 Starting generation for {len(scenes)} scene(s)")
     print("=" * 80)
 
-    success_count = 0
-    fail_count = 0
-    actual_cost = 0
-
     outputs_dir = Path(__file__).parent.parent / 'outputs'
 
-    for i, record in enumerate(scenes, 1):
-        print("\n" + "-" * 80)
-        fields = record['fields']
-        scene_name = fields.get('scene', f'Scene {i}')
-        print(f"Scene {i}/{len(scenes)}: {scene_name}")
-        print("-" * 80)
-
-        # Get image URL and video prompt
-        try:
-            image_url = get_image_url_from_record(record)
-            video_prompt = fields.get('video_prompt', '')
-
-            if not video_prompt:
-                print("⚠️  No video_prompt found, skipping...")
-                continue
+    # Each video spends 2-4 minutes waiting on Kie.ai, so generate several
+    # scenes at once; the pool size keeps us within the API rate limit
+    def run_scene(numbered_scene):
+        i, scene = numbered_scene
+        return process_scene(
+            scene, i, len(scenes), config, model_config,
+            aspect_ratio=args.aspect_ratio or model_config['default_aspect_ratio'],
+            n_frames=args.duration,
+            remove_watermark=args.remove_watermark
+        )
 
-        except Exception as e:
-            print(f"❌ Error getting scene data: {e}")
-            fail_count += 1
-            continue
+    # Attach finished videos in Airtable 10 at a time as results come in
+    success_count = 0
+    fail_count = 0
+    pending = {}
 
+    def flush_pending():
+        nonlocal success_count, fail_count
+        if not pending:
+            return
         try:
-            # Create generation task
-            task_id = create_video_generation_task(
-                prompt=video_prompt,
-                image_url=image_url,
-                model_name=model_config['name'],
-                api_key=config['kie_api_key'],
-                model_config=model_config,
-                aspect_ratio=args.aspect_ratio or model_config['default_aspect_ratio'],
-                n_frames=args.duration,
-                remove_watermark=args.remove_watermark
-            )
-
-            # Poll for completion
-            result_urls = poll_task_status(task_id, config['kie_api_key'])
-
-            if not result_urls:
-                raise Exception("No result URLs returned")
-
-            video_url = result_urls[0]
-
-            # Update Airtable
-            update_airtable_record(
-                record['id'],
-                video_url,
-                config['airtable_token'],
-                config['airtable_base_id']
-            )
+            update_airtable_records(pending, table)
+            success_count += len(pending)
+        except Exception as e:
+            print(f"❌ {e}")
+            fail_count += len(pending)
+        pending.clear()
+
+    # Downloads run on their own small pool so a finished video never holds
+    # a generation slot while it downloads and normalizes
+    download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    download_futures = []
+
+    # Size the HTTP connection pool for every thread that will share it
+    concurrency = max(1, args.concurrency)
+    mount_http_adapter(SESSION, concurrency)
+
+    # Handle scenes in the order they finish rather than the order they were
+    # submitted, so a slow video doesn't hold back the Airtable updates of
+    # the ones that are already done
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(run_scene, numbered_scene): numbered_scene
+            for numbered_scene in enumerate(scenes, 1)
+        }
+        for future in as_completed(futures):
+            i, scene = futures[future]
+            result = future.result()
+            if result is None:
+                continue
+            if result is False:
+                fail_count += 1
+                continue
 
-            # Download video locally (unless skipped)
             if not args.skip_download:
-                video_filename = f"scene_{i}_{scene_name.replace(' ', '_')[:30]}.mp4"
-                video_path = outputs_dir / video_filename
-                download_video(video_url, video_path)
+                video_path = scene_video_path(outputs_dir, i, scene)
+                download_futures.append(
+                    download_executor.submit(save_scene_video, result, video_path, not args.skip_normalize)
+                )
 
-            success_count += 1
-            actual_cost += model_config['cost']
+            pending[scene.record_id] = result
+            if len(pending) >= AIRTABLE_BATCH_SIZE:
+                flush_pending()
 
-            # Rate limit protection - wait between videos
-            if i < len(scenes):
-                print(f"\n⏸️  Waiting 5s before next video...")
-                time.sleep(5)
+    flush_pending()
 
-        except Exception as e:
-            print(f"❌ Error generating video: {e}")
-            fail_count += 1
-            continue
+    download_failures = 0
+    for future in as_completed(download_futures):
+        if not future.result():
+            download_failures += 1
+    download_executor.shutdown()
+    actual_cost = success_count * model_config['cost']
 
     # Final summary
     print("\n" + "=" * 80)
@@ -646,6 +1021,8 @@ Example Usage:
     print("=" * 80)
     print(f"✅ Successful: {success_count}")
     print(f"❌ Failed: {fail_count}")
+    if download_failures:
+        print(f"⚠️  Downloads failed: {download_failures}")
     print(f"💰 Actual cost: ${actual_cost:.2f}")
     print("=" * 80)
 
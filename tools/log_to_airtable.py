@@ -21,10 +21,24 @@ from dotenv import load_dotenv
 import yaml
 from pyairtable import Api
 
+from _airtable_cache import invalidate_table
+
+# Prefer the libyaml C loader when available (much faster on large documents)
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Fix Windows console encoding for emojis
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Airtable accepts at most 10 records per batch request
+AIRTABLE_BATCH_SIZE = 10
+
+# A scene is identified by its project and scene name when re-logging
+UPSERT_KEY_FIELDS = ['Project Name', 'scene']
+
 
 def load_config():
     """Load Airtable API key and Base ID from .env file"""
@@ -58,8 +72,9 @@ def load_prompts(prompts_path):
         print(f"❌ Error: Prompts file not found: {prompts_path}")
         sys.exit(1)
 
-    with open(prompts_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    # Pass raw bytes and let the loader detect the encoding itself
+    with open(prompts_path, 'rb') as f:
+        data = yaml.load(f, Loader=_Loader)
 
     prompts = data.get('prompts', [])
     print(f"✅ Loaded {len(prompts)} scene prompts")
@@ -74,43 +89,16 @@ def create_or_get_table(api, base_id, table_name='Scenes'):
     return table
 
 
-def clear_existing_records(table, project_name=None):
-    """Clear existing records from the table"""
-    print("\n🗑️  Checking for existing records...")
-
-    try:
-        if project_name:
-            # Only delete records with matching project name
-            formula = f"{{Project Name}}='{project_name}'"
-            records = table.all(formula=formula)
-        else:
-            # Delete all records
-            records = table.all()
-
-        if records:
-            print(f"   Found {len(records)} existing record(s)")
-            print("   Deleting existing records...")
-
-            record_ids = [record['id'] for record in records]
-            # Delete in batches of 10 (Airtable limit)
-            for i in range(0, len(record_ids), 10):
-                batch = record_ids[i:i+10]
-                table.batch_delete(batch)
-
-            print(f"✅ Deleted {len(records)} existing record(s)")
-        else:
-            print("✅ No existing records found")
-    except Exception as e:
-        print(f"⚠️  Warning: Could not clear records: {e}")
-        print("   Continuing anyway...")
-
-
 def log_prompts_to_airtable(table, prompts, project_name):
-    """Log prompts to Airtable"""
-    print(f"\n📝 Logging {len(prompts)} scenes to Airtable...")
+    """
+    Log prompts to Airtable
 
-    records_created = []
+    Scenes are upserted on (Project Name, scene), so re-running for the same
+    project updates the existing records in place instead of duplicating them.
+    """
+    print(f"\n📝 Logging {len(prompts)} scenes to Airtable...")
 
+    records = []
     for prompt in prompts:
         scene_num = prompt['scene_number']
         scene_desc = prompt['scene_description']
@@ -123,26 +111,70 @@ def log_prompts_to_airtable(table, prompts, project_name):
             scene_title = scene_desc
         scene_full = f"{scene_id} - {scene_title}"
 
-        # Prepare record
-        record = {
+        # Prepare record; clearing the attachments makes an updated scene
+        # start over like a freshly created one, so its image and video
+        # are regenerated from the new prompts
+        records.append({'fields': {
             'Project Name': project_name,
             'scene': scene_full,
             'start_image_prompt': prompt['image_prompt'],
-            'video_prompt': prompt['video_prompt']
-            # start_image and scene_video will be uploaded later
-        }
-
-        # Create record in Airtable
+            'video_prompt': prompt['video_prompt'],
+            'start_image': [],
+            'scene_video': []
+        }})
+
+    # Upsert in batches of 10 (Airtable limit); a failed batch doesn't stop
+    # the others
+    records_logged = []
+    for i in range(0, len(records), AIRTABLE_BATCH_SIZE):
+        batch = records[i:i + AIRTABLE_BATCH_SIZE]
         try:
-            created = table.create(record)
-            print(f"   ✓ Logged: {scene_id}")
-            records_created.append(created)
+            result = table.batch_upsert(batch, key_fields=UPSERT_KEY_FIELDS)
+            created_ids = set(result.get('createdRecords', []))
+            for record in result['records']:
+                action = 'Logged' if record['id'] in created_ids else 'Updated'
+                print(f"   ✓ {action}: {record['fields']['scene']}")
+            records_logged.extend(result['records'])
         except Exception as e:
-            print(f"   ❌ Error logging {scene_id}: {e}")
-            # Continue with other records
+            for record in batch:
+                print(f"   ❌ Error logging {record['fields']['scene']}: {e}")
+
+    if records_logged:
+        invalidate_table(table)
 
-    print(f"\n✅ Successfully logged {len(records_created)} records to Airtable")
-    return records_created
+    print(f"\n✅ Successfully logged {len(records_logged)} records to Airtable")
+    return records_logged
+
+
+def clear_stale_records(table, project_name, keep_ids):
+    """Delete the project's records that weren't part of this run's upsert"""
+    print("\n🗑️  Checking for stale records...")
+
+    try:
+        if project_name:
+            # Only look at records with matching project name
+            formula = f"{{Project Name}}='{project_name}'"
+            records = table.all(formula=formula, fields=['scene'])
+        else:
+            records = table.all(fields=['scene'])
+
+        stale_ids = [record['id'] for record in records if record['id'] not in keep_ids]
+        if stale_ids:
+            print(f"   Found {len(stale_ids)} stale record(s)")
+            print("   Deleting stale records...")
+
+            # Delete in batches of 10 (Airtable limit)
+            for i in range(0, len(stale_ids), AIRTABLE_BATCH_SIZE):
+                batch = stale_ids[i:i + AIRTABLE_BATCH_SIZE]
+                table.batch_delete(batch)
+
+            invalidate_table(table)
+            print(f"✅ Deleted {len(stale_ids)} stale record(s)")
+        else:
+            print("✅ No stale records found")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not clear records: {e}")
+        print("   Continuing anyway...")
 
 
 def display_summary(records, metadata):
@@ -182,7 +214,7 @@ def main():
     )
     parser.add_argument(
         '--clear',
-        help='Clear existing records before logging (default: True)',
+        help="Delete the project's records that are no longer in the prompts file (default: True)",
         action='store_true',
         default=True
     )
@@ -204,13 +236,14 @@ def main():
     # Connect to table
     table = create_or_get_table(api, base_id, args.table)
 
-    # Clear existing records if requested
-    if args.clear:
-        clear_existing_records(table, args.project_name)
-
     # Log prompts
     records = log_prompts_to_airtable(table, prompts, args.project_name)
 
+    # Remove scenes left over from a previous run if requested; skipped after
+    # a failed batch so records that couldn't be updated are kept
+    if args.clear and len(records) == len(prompts):
+        clear_stale_records(table, args.project_name, {record['id'] for record in records})
+
     # Display summary
     display_summary(records, metadata)
 
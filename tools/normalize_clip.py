@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Clip Normalizer for Creative Cloner
+
+Re-encodes generated scene clips to one shared format (codec, frame rate,
+pixel format, timescale, audio rate) so combine_all.py can always join
+them with a fast copy concat instead of a full re-encode.
+
+The parameters used, plus the clip's frame size and stream layout, are
+recorded in a `<clip>.norm.json` sidecar next to each clip; combine_all.py
+reads these to skip stream probing when every clip was normalized the same
+way and has the same size and streams.
+
+Usage:
+    python tools/normalize_clip.py outputs/scene_1_*.mp4
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+
+# Fix Windows console encoding for emojis
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Target format shared by all normalized clips
+NORMALIZED_FORMAT = {
+    'video_codec': 'libx264',
+    'frame_rate': '30',
+    'pix_fmt': 'yuv420p',
+    'video_track_timescale': '15360',
+    'audio_codec': 'aac',
+    'audio_sample_rate': '48000',
+    'audio_channels': '2'
+}
+
+
+def sidecar_path(video_path):
+    """Path of the sidecar file recording a clip's normalization parameters"""
+    video_path = Path(video_path)
+    return video_path.with_name(f"{video_path.name}.norm.json")
+
+
+def read_sidecar(video_path):
+    """Return the recorded normalization parameters for a clip, or None"""
+    try:
+        with open(sidecar_path(video_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_normalized(sidecar):
+    """True if a sidecar records the current NORMALIZED_FORMAT"""
+    return bool(sidecar) and all(sidecar.get(key) == value for key, value in NORMALIZED_FORMAT.items())
+
+
+def probe_layout(video_path):
+    """
+    Probe the frame size and stream layout of a clip
+
+    NORMALIZED_FORMAT doesn't pin the resolution or require an audio track,
+    so these are recorded separately for combine_all.py to compare.
+
+    Returns: {'width', 'height', 'stream_layout'} or None if probing failed
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'stream=codec_type,width,height',
+             '-of', 'json', str(video_path)],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        streams = json.loads(result.stdout).get('streams', []) if result.returncode == 0 else None
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+
+    if not streams:
+        return None
+
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'), {})
+    return {
+        'width': video.get('width'),
+        'height': video.get('height'),
+        'stream_layout': [stream.get('codec_type') for stream in streams]
+    }
+
+
+def write_sidecar(video_path):
+    """Record NORMALIZED_FORMAT plus the clip's probed layout next to it"""
+    sidecar = dict(NORMALIZED_FORMAT)
+    layout = probe_layout(video_path)
+    if layout:
+        sidecar.update(layout)
+    with open(sidecar_path(video_path), 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f)
+    return sidecar
+
+
+def normalize_clip(video_path, timeout=600):
+    """
+    Re-encode a clip in place to NORMALIZED_FORMAT and write its sidecar
+
+    Returns: True on success
+    """
+    video_path = Path(video_path)
+    print(f"\n🎞️  Normalizing clip: {video_path.name}")
+
+    sidecar = read_sidecar(video_path)
+    if is_normalized(sidecar):
+        # Sidecars written before the layout was recorded get it added now
+        if 'stream_layout' not in sidecar:
+            write_sidecar(video_path)
+        print("✅ Already normalized")
+        return True
+
+    if not shutil.which('ffmpeg'):
+        print("⚠️  FFmpeg not found, skipping normalization")
+        return False
+
+    fmt = NORMALIZED_FORMAT
+    # Not an .mp4 name, so a leftover from an interrupted run is never
+    # picked up as a scene clip by combine_all.py
+    tmp_path = video_path.with_name(f"{video_path.stem}.norm.tmp")
+    cmd = [
+        'ffmpeg',
+        '-v', 'error',
+        '-i', str(video_path),
+        '-c:v', fmt['video_codec'],
+        '-r', fmt['frame_rate'],
+        '-pix_fmt', fmt['pix_fmt'],
+        '-video_track_timescale', fmt['video_track_timescale'],
+        '-c:a', fmt['audio_codec'],
+        '-ar', fmt['audio_sample_rate'],
+        '-ac', fmt['audio_channels'],
+        '-movflags', '+faststart',
+        '-f', 'mp4',
+        '-y',
+        str(tmp_path)
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"❌ FFmpeg timed out after {timeout}s")
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+    if result.returncode != 0:
+        print(f"❌ Normalization failed:")
+        print(f"   Error: {result.stderr}")
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+    os.replace(tmp_path, video_path)
+    write_sidecar(video_path)
+
+    size_mb = video_path.stat().st_size / (1024 * 1024)
+    print(f"✅ Normalized ({size_mb:.2f} MB)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Normalize generated clips to a shared format for copy concat'
+    )
+    parser.add_argument(
+        'videos',
+        nargs='+',
+        help='Video clip(s) to normalize in place'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🎞️  Creative Cloner - Clip Normalizer")
+    print("=" * 80)
+
+    failed = [video for video in args.videos if not normalize_clip(video)]
+
+    print("\n" + "=" * 80)
+    print(f"✅ Normalized: {len(args.videos) - len(failed)}")
+    print(f"❌ Failed: {len(failed)}")
+    print("=" * 80)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
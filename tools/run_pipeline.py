@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner for Creative Cloner
+
+Runs video analysis and prompt creation as a single pipeline:
+1. Upload + analyze the inspiration video (SEALCaM)
+2. Upload + describe the reference image
+3. Create image and video prompts once both are ready
+
+Steps 1 and 2 run concurrently, so the reference image is described
+while Gemini is still processing the video.
+
+Usage:
+    python tools/run_pipeline.py inputs/inspo.mp4 inputs/Ref.png
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import functools
+from pathlib import Path
+from google import genai
+from google.genai import types
+
+from analyze_video import (
+    load_api_key,
+    start_video_upload,
+    processing_poll_delays,
+    finish_processing,
+    analyze_video,
+    parse_to_yaml,
+    save_analysis,
+    video_cache_key,
+    load_cached_analysis,
+    save_cached_analysis
+)
+from create_prompts import (
+    load_analysis,
+    upload_reference_image,
+    describe_reference,
+    reference_cache_key,
+    load_cached_description,
+    save_cached_description,
+    create_prompts,
+    save_prompts,
+    print_prompts
+)
+
+# Fix Windows console encoding for emojis
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """Run a blocking SDK call in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def wait_ready(video_file, client, max_wait):
+    """
+    Wait for Gemini to process the video without holding a worker thread
+
+    Sleeping happens on the event loop, so the reference image branch can
+    use the executor while the video is still processing.
+    """
+    start_time = time.time()
+    delays = processing_poll_delays()
+    while video_file.state == types.FileState.PROCESSING:
+        if time.time() - start_time > max_wait:
+            print(f"❌ Video processing did not finish within {max_wait} seconds")
+            sys.exit(1)
+
+        await asyncio.sleep(next(delays))
+        video_file = await run_in_thread(client.files.get, name=video_file.name)
+
+    return finish_processing(video_file)
+
+
+async def run_video_branch(client, video_path, analysis_path, max_wait, use_cache=True):
+    """Upload, process and analyze the video, then save the analysis YAML"""
+    cache_dir = Path(analysis_path).parent / '.cache'
+    cache_key = await run_in_thread(video_cache_key, video_path)
+    if use_cache:
+        yaml_content = load_cached_analysis(cache_dir, cache_key)
+        if yaml_content is not None:
+            save_analysis(yaml_content, analysis_path)
+            return
+
+    video_file = await run_in_thread(start_video_upload, video_path, client)
+
+    try:
+        video_file = await wait_ready(video_file, client, max_wait)
+        analysis = await run_in_thread(analyze_video, video_file, client)
+    finally:
+        await run_in_thread(client.files.delete, name=video_file.name)
+
+    yaml_content = parse_to_yaml(analysis)
+    save_cached_analysis(cache_dir, cache_key, yaml_content)
+    save_analysis(yaml_content, analysis_path)
+
+
+async def run_reference_branch(client, image_path, cache_dir, use_cache=True):
+    """Describe the reference image, reusing the cached description when possible"""
+    cache_key = reference_cache_key(image_path)
+    if use_cache:
+        description = load_cached_description(cache_dir, cache_key)
+        if description:
+            return description
+
+    image_file = await run_in_thread(upload_reference_image, image_path, client)
+
+    try:
+        description = await run_in_thread(describe_reference, image_file, client)
+    finally:
+        await run_in_thread(client.files.delete, name=image_file.name)
+
+    save_cached_description(cache_dir, cache_key, description)
+    return description
+
+
+async def run_pipeline(args):
+    """Run both Gemini branches concurrently, then build the prompts"""
+    api_key = load_api_key()
+    client = genai.Client(api_key=api_key)
+    print("✅ Gemini API configured\n")
+
+    _, subject_description = await asyncio.gather(
+        run_video_branch(
+            client,
+            args.video_path,
+            args.analysis,
+            args.timeout,
+            use_cache=not args.no_cache
+        ),
+        run_reference_branch(
+            client,
+            args.reference_image,
+            Path(args.output).parent / '.ref_cache',
+            use_cache=not args.no_cache
+        )
+    )
+
+    analysis = load_analysis(args.analysis)
+    prompts = create_prompts(analysis, subject_description)
+    save_prompts(prompts, args.output, analysis)
+    print_prompts(prompts)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Analyze a video and create prompts for a reference image in one run'
+    )
+    parser.add_argument(
+        'video_path',
+        help='Path to the video file to analyze'
+    )
+    parser.add_argument(
+        'reference_image',
+        help='Path to reference image of your product/character'
+    )
+    parser.add_argument(
+        '-a', '--analysis',
+        help='Output path for video analysis YAML (default: outputs/analysis.yaml)',
+        default='outputs/analysis.yaml'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Output path for prompts YAML (default: outputs/prompts.yaml)',
+        default='outputs/prompts.yaml'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        default=600,
+        help='Max seconds to wait for Gemini to process the video (default: 600)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-analyze the video and reference image instead of using the caches'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🚀 Creative Cloner - Analysis + Prompt Pipeline")
+    print("=" * 80)
+
+    asyncio.run(run_pipeline(args))
+
+    print("\n✨ Done! Prompts ready for image and video generation.")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,13 +7,97 @@ Checks that all prerequisites are installed and configured.
 
 import sys
 import os
-import subprocess
-from pathlib import Path
+import io
+import re
+import argparse
+import threading
+import importlib.util
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
 
 # Fix Windows console encoding for emojis
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Results of checks already run in this process: (check, args) -> (result, output)
+CHECK_RESULTS = {}
+
+# Banner rule used around the header and summary
+BAR = "=" * 80
+
+# Repository root (the folder containing tools/), resolved once
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages the tools need: import name -> distribution (pip) name, already
+# in normalize_dist_name() form (google-genai, python-dotenv, PyYAML, ...)
+REQUIRED_PACKAGES = {
+    'google.genai': 'google_genai',
+    'dotenv': 'python_dotenv',
+    'yaml': 'pyyaml',
+    'pyairtable': 'pyairtable',
+    'requests': 'requests'
+}
+
+# API keys that must be set in .agent/.env, in reporting order
+REQUIRED_KEYS = ('GEMINI_API_KEY', 'KIE_API_KEY', 'AIRTABLE_API_TOKEN', 'AIRTABLE_BASE_ID')
+REQUIRED_KEY_SET = frozenset(REQUIRED_KEYS)
+
+# Matches a "KEY=value" line for any required key (commented-out lines don't match)
+ENV_KEY_PATTERN = re.compile(
+    r'^[ \t]*(' + '|'.join(map(re.escape, REQUIRED_KEYS)) + r')[ \t]*=(.*)$',
+    re.MULTILINE
+)
+
+# Project directories expected next to tools/
+REQUIRED_DIRS = ('inputs', 'outputs', 'tools')
+
+
+class CheckOutput:
+    """
+    Stand-in for sys.stdout while the checks run
+
+    Prints from a thread inside run() go to that thread's own buffer; all
+    other writes pass straight through to the real stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def run(self, check):
+        """
+        Run one check with its output captured
+
+        Returns: (check result, captured output)
+        """
+        self.local.buffer = io.StringIO()
+        try:
+            return check(), self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
+
+
+def run_check(output, check, *args):
+    """
+    Run a check with its output captured, once per process
+
+    main() may be called more than once in the same interpreter (e.g. from
+    another script); later calls reuse the first result and output.
+
+    Returns: (check result, captured output)
+    """
+    key = (check, args)
+    if key not in CHECK_RESULTS:
+        CHECK_RESULTS[key] = output.run(lambda: check(*args))
+    return CHECK_RESULTS[key]
+
 
 def check_python_version():
     """Check Python version is 3.8+"""
@@ -26,48 +110,97 @@ def check_python_version():
         print(f"   ❌ Python {version.major}.{version.minor}.{version.micro} (need 3.8+)")
         return False
 
-def check_ffmpeg():
-    """Check if FFmpeg is installed"""
+def check_ffmpeg(verbose=False):
+    """Check if FFmpeg is installed (runs it for the version string only when verbose)"""
+    import shutil
+
     print("\n🎬 Checking FFmpeg...")
+    ffmpeg_path = shutil.which('ffmpeg')
+    if ffmpeg_path is None:
+        print("   ❌ FFmpeg not installed")
+        print("      Install: https://ffmpeg.org/download.html")
+        return False
+
+    if not verbose:
+        print(f"   ✅ FFmpeg found: {ffmpeg_path}")
+        return True
+
+    import subprocess
+
     try:
-        result = subprocess.run(
-            ['ffmpeg', '-version'],
-            capture_output=True,
+        # Only the first line ("ffmpeg version ...") is needed; skip decoding
+        # the long build configuration that follows it
+        proc = subprocess.Popen(
+            [ffmpeg_path, '-version'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=5
+            errors='replace'
         )
-        if result.returncode == 0:
-            version = result.stdout.split('\n')[0]
+        try:
+            version = proc.stdout.readline().rstrip()
+        finally:
+            proc.stdout.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+
+        # Closing the pipe early can end ffmpeg with a broken-pipe status,
+        # so judge by the banner rather than the exit code
+        if version.startswith('ffmpeg'):
             print(f"   ✅ {version}")
             return True
         else:
             print("   ❌ FFmpeg found but returned error")
             return False
-    except FileNotFoundError:
-        print("   ❌ FFmpeg not installed")
-        print("      Install: https://ffmpeg.org/download.html")
-        return False
     except Exception as e:
         print(f"   ❌ Error checking FFmpeg: {e}")
         return False
 
+def normalize_dist_name(name):
+    """Normalize a distribution name for comparison (PyYAML -> pyyaml, python-dotenv -> python_dotenv)"""
+    return name.lower().replace('-', '_').replace('.', '_')
+
+
+def installed_distributions():
+    """
+    Names of all installed distributions, from one scan of the *.dist-info folders
+
+    Returns: set of normalized names
+    """
+    names = set()
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            names.add(normalize_dist_name(name))
+    return names
+
+
 def check_dependencies():
     """Check if Python packages are installed"""
     print("\n📦 Checking Python dependencies...")
-    required = [
-        'google.genai',
-        'dotenv',
-        'yaml',
-        'pyairtable',
-        'requests'
-    ]
 
+    # One scan of the installed distributions answers most packages; the
+    # rest are located with find_spec (importing them would run their
+    # heavy module code)
+    installed = installed_distributions()
     all_installed = True
-    for package in required:
-        try:
-            __import__(package.replace('-', '_'))
+    for package, dist_name in REQUIRED_PACKAGES.items():
+        if dist_name in installed:
+            found = True
+        else:
+            try:
+                found = importlib.util.find_spec(package) is not None
+            except ImportError:
+                # Dotted names import their parent package, which may be missing
+                found = False
+
+        if found:
             print(f"   ✅ {package}")
-        except ImportError:
+        else:
             print(f"   ❌ {package} not installed")
             all_installed = False
 
@@ -80,9 +213,13 @@ def check_env_file():
     """Check if .env file exists and has required keys"""
     print("\n🔑 Checking environment configuration...")
 
-    env_path = Path(__file__).parent.parent / '.agent' / '.env'
+    env_path = os.path.join(REPO_ROOT, '.agent', '.env')
 
-    if not env_path.exists():
+    # Just open it; a missing file shows up as FileNotFoundError
+    try:
+        with open(env_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
         print(f"   ❌ .env file not found")
         print(f"      Expected: {env_path}")
         print("      Run: cp .env.example .agent/.env")
@@ -90,20 +227,22 @@ def check_env_file():
 
     print(f"   ✅ .env file exists")
 
-    # Check for required keys
-    required_keys = [
-        'GEMINI_API_KEY',
-        'KIE_API_KEY',
-        'AIRTABLE_API_TOKEN',
-        'AIRTABLE_BASE_ID'
-    ]
-
-    missing_keys = []
-    with open(env_path, 'r') as f:
-        content = f.read()
-        for key in required_keys:
-            if f"{key}=" not in content or f"{key}=your_" in content:
-                missing_keys.append(key)
+    # One regex pass over the file, noting which keys are set and which
+    # still hold the your_... placeholder from .env.example
+
+    found = set()
+    placeholder = set()
+    for match in ENV_KEY_PATTERN.finditer(content):
+        key, value = match.groups()
+        found.add(key)
+        if value.strip().startswith('your_'):
+            placeholder.add(key)
+        # Every key has been seen; the rest of the file doesn't matter
+        if len(found) == len(REQUIRED_KEY_SET):
+            break
+
+    missing = (REQUIRED_KEY_SET - found) | placeholder
+    missing_keys = [key for key in REQUIRED_KEYS if key in missing]
 
     if missing_keys:
         print("   ⚠️  Missing or placeholder API keys:")
@@ -118,13 +257,13 @@ def check_directories():
     """Check if required directories exist"""
     print("\n📁 Checking directories...")
 
-    base_path = Path(__file__).parent.parent
-    required_dirs = ['inputs', 'outputs', 'tools']
+    # One directory listing answers every check; entry types come from the
+    # listing itself, without a stat per directory
+    with os.scandir(REPO_ROOT) as entries:
+        present = {entry.name for entry in entries if entry.is_dir()}
 
-    all_exist = True
-    for dir_name in required_dirs:
-        dir_path = base_path / dir_name
-        if dir_path.exists():
+    for dir_name in REQUIRED_DIRS:
+        if dir_name in present:
             print(f"   ✅ {dir_name}/")
         else:
             print(f"   ⚠️  {dir_name}/ not found (will be created when needed)")
@@ -132,30 +271,68 @@ def check_directories():
     return True
 
 def main():
-    print("=" * 80)
-    print("🔍 Creative Cloner - Setup Verification")
-    print("=" * 80)
-
-    checks = [
-        ("Python Version", check_python_version()),
-        ("FFmpeg", check_ffmpeg()),
-        ("Python Dependencies", check_dependencies()),
-        ("Environment File", check_env_file()),
-        ("Directories", check_directories())
-    ]
-
-    print("\n" + "=" * 80)
-    print("📊 Summary")
-    print("=" * 80)
-
-    all_passed = True
+    parser = argparse.ArgumentParser(
+        description='Check that Creative Cloner prerequisites are installed and configured'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Run ffmpeg to report its version instead of only locating it'
+    )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='Run the checks one at a time and stop at the first failure'
+    )
+    args = parser.parse_args()
+
+    sys.stdout.write(f"{BAR}\n🔍 Creative Cloner - Setup Verification\n{BAR}\n")
+
+    check_defs = (
+        ("Python Version", check_python_version, ()),
+        ("FFmpeg", check_ffmpeg, (args.verbose,)),
+        ("Python Dependencies", check_dependencies, ()),
+        ("Environment File", check_env_file, ()),
+        ("Directories", check_directories, ())
+    )
+
+    checks = []
+    output = CheckOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        if args.fail_fast:
+            # One at a time, stopping at the first failure
+            for name, check, check_args in check_defs:
+                passed, text = run_check(output, check, *check_args)
+                output.stream.write(text)
+                checks.append((name, passed))
+                if not passed:
+                    break
+        else:
+            # The checks are independent and mostly wait on the filesystem or
+            # a subprocess, so run them at once; each one's output is
+            # buffered and printed in the usual order
+            with ThreadPoolExecutor(max_workers=len(check_defs)) as executor:
+                futures = [
+                    executor.submit(run_check, output, check, *check_args)
+                    for _, check, check_args in check_defs
+                ]
+                for (name, _, _), future in zip(check_defs, futures):
+                    passed, text = future.result()
+                    output.stream.write(text)
+                    checks.append((name, passed))
+    finally:
+        sys.stdout = output.stream
+
+    # Build the summary block and write it in one go
+    summary = ["", BAR, "📊 Summary", BAR]
     for name, passed in checks:
         status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status}: {name}")
-        if not passed:
-            all_passed = False
+        summary.append(f"{status}: {name}")
+    summary.append(BAR)
+    sys.stdout.write("\n".join(summary) + "\n")
 
-    print("=" * 80)
+    all_passed = all(passed for _, passed in checks)
 
     if all_passed:
         print("\n🎉 All checks passed! You're ready to use Creative Cloner.")